@@ -0,0 +1,111 @@
+"""
+Checkpointers intercambiables para los grafos con intervención humana.
+
+CHECKPOINTER elige el backend:
+    memory    en memoria del proceso (por defecto)
+    sqlite    archivo local en CHECKPOINTER_URI (por defecto ~/.cache/langgraph/checkpoints.sqlite3)
+    postgres  base compartida en CHECKPOINTER_URI, para atender revisiones desde varios workers
+
+Con CHECKPOINT_EXTERNALIZE los textos largos se guardan una sola vez en un directorio de blobs:
+    memory    no se externaliza (el estado no sobrevive al proceso)
+    sqlite    CHECKPOINT_BLOB_DIR o, por defecto, <archivo sqlite>.blobs junto a la base
+    postgres  solo si CHECKPOINT_BLOB_DIR apunta a un almacenamiento compartido por todos los workers;
+              un directorio local impediría cargar en un worker los checkpoints escritos por otro
+
+Uso:
+    async with open_checkpointer() as checkpointer:
+        graph = workflow.compile(checkpointer=checkpointer)
+        await graph.ainvoke(state, config, durability=CHECKPOINT_DURABILITY)
+
+Al cerrar un checkpointer sqlite o postgres que externaliza blobs se ejecuta compact() si la última
+limpieza es más antigua que CHECKPOINT_COMPACT_INTERVAL: borra los hilos sin actividad desde hace
+CHECKPOINT_IDLE_SECONDS (si se indica) y los blobs que ya no referencia ningún checkpoint.
+"""
+import os
+import time
+from contextlib import asynccontextmanager
+from langgraph.checkpoint.memory import MemorySaver
+from checkpointing.serde import BLOB_DIR, ExternalizingSerializer, compact
+from meeting_minutes_agent.utils.store import ContentStore
+
+CHECKPOINTER = os.getenv("CHECKPOINTER", "memory")
+CHECKPOINTER_URI = os.getenv("CHECKPOINTER_URI")
+SQLITE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "langgraph", "checkpoints.sqlite3")
+POSTGRES_POOL_SIZE = int(os.getenv("CHECKPOINTER_POOL_SIZE", "10"))
+
+# "exit" guarda un solo checkpoint por ejecución (al terminar o al llegar a una interrupción)
+# en lugar de uno por paso; "async" y "sync" guardan cada paso.
+CHECKPOINT_DURABILITY = os.getenv("CHECKPOINT_DURABILITY", "exit")
+
+# Los textos y artefactos grandes se guardan una sola vez fuera de los checkpoints (CHECKPOINT_EXTERNALIZE=0 lo desactiva)
+CHECKPOINT_EXTERNALIZE = os.getenv("CHECKPOINT_EXTERNALIZE", "1") != "0"
+
+# Segundos mínimos entre dos limpiezas automáticas (0 las desactiva)
+CHECKPOINT_COMPACT_INTERVAL = float(os.getenv("CHECKPOINT_COMPACT_INTERVAL", str(24 * 3600)))
+# Antigüedad a partir de la cual se borran los hilos sin actividad; sin valor se conservan todos
+CHECKPOINT_IDLE_SECONDS = float(os.environ["CHECKPOINT_IDLE_SECONDS"]) if os.getenv("CHECKPOINT_IDLE_SECONDS") else None
+
+
+async def _compact_if_due(checkpointer, serde) -> dict:
+    if not isinstance(serde, ExternalizingSerializer) or not CHECKPOINT_COMPACT_INTERVAL:
+        return None
+    # La fecha de la última limpieza vive junto a los blobs, así la comparten todos los procesos que los usan
+    marker = os.path.join(serde.store.directory, ".last_compaction")
+    if os.path.exists(marker) and time.time() - os.path.getmtime(marker) < CHECKPOINT_COMPACT_INTERVAL:
+        return None
+    # Se marca antes de empezar para que otro worker no la repita al mismo tiempo
+    with open(marker, "a"):
+        pass
+    os.utime(marker)
+    try:
+        return await compact(checkpointer, serde, idle_seconds=CHECKPOINT_IDLE_SECONDS)
+    except Exception as e:
+        print(f"⚠️  No se pudo completar la limpieza de checkpoints: {e}")
+        return None
+
+
+@asynccontextmanager
+async def open_checkpointer(kind: str = None, uri: str = None, serde=None):
+    kind = kind or CHECKPOINTER
+    uri = uri or CHECKPOINTER_URI
+    externalize = serde is None and CHECKPOINT_EXTERNALIZE
+
+    if kind == "memory":
+        yield MemorySaver(serde=serde)
+
+    elif kind == "sqlite":
+        try:
+            import aiosqlite
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError:
+            raise ImportError("CHECKPOINTER=sqlite requiere el paquete langgraph-checkpoint-sqlite")
+        path = uri or SQLITE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if externalize:
+            serde = ExternalizingSerializer(ContentStore(BLOB_DIR or f"{path}.blobs"))
+        async with aiosqlite.connect(path) as connection:
+            checkpointer = AsyncSqliteSaver(connection, serde=serde)
+            await checkpointer.setup()
+            yield checkpointer
+            await _compact_if_due(checkpointer, serde)
+
+    elif kind == "postgres":
+        try:
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+            from psycopg.rows import dict_row
+            from psycopg_pool import AsyncConnectionPool
+        except ImportError:
+            raise ImportError("CHECKPOINTER=postgres requiere los paquetes langgraph-checkpoint-postgres y psycopg-pool")
+        if not uri:
+            raise ValueError("CHECKPOINTER=postgres requiere CHECKPOINTER_URI")
+        if externalize and BLOB_DIR:
+            serde = ExternalizingSerializer(ContentStore(BLOB_DIR))
+        connection_kwargs = {"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row}
+        async with AsyncConnectionPool(uri, max_size=POSTGRES_POOL_SIZE, kwargs=connection_kwargs) as pool:
+            checkpointer = AsyncPostgresSaver(pool, serde=serde)
+            await checkpointer.setup()
+            yield checkpointer
+            await _compact_if_due(checkpointer, serde)
+
+    else:
+        raise ValueError(f"Checkpointer desconocido: {kind}")
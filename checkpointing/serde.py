@@ -0,0 +1,126 @@
+import json
+import os
+import time
+from datetime import datetime
+from contextlib import contextmanager
+from typing import Any, Optional
+from langchain_core.messages import BaseMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from meeting_minutes_agent.utils.store import ContentStore
+
+BLOB_PREFIX = "\x00blob:"
+BLOB_KEY = "__blob__"
+# Textos a partir de este tamaño (en caracteres) se guardan fuera del checkpoint
+BLOB_MIN_CHARS = int(os.getenv("CHECKPOINT_BLOB_MIN_CHARS", "4096"))
+# Directorio de blobs configurado explícitamente; con postgres debe ser almacenamiento compartido por todos los workers
+BLOB_DIR = os.getenv("CHECKPOINT_BLOB_DIR")
+
+
+class ExternalizingSerializer:
+    """
+    Serializador de checkpoints que guarda una sola vez, por su hash, los textos largos (contenido de mensajes,
+    transcripción y cualquier otro valor de texto del estado); el checkpoint solo conserva la referencia.
+    """
+
+    def __init__(self, store: ContentStore, min_chars: int = BLOB_MIN_CHARS, inner=None):
+        self.store = store
+        self.min_chars = min_chars
+        self.inner = inner or JsonPlusSerializer()
+        self._collected: Optional[set] = None
+
+    @contextmanager
+    def collect_references(self):
+        """Reúne las claves de todos los blobs leídos mientras dura el bloque."""
+        self._collected = set()
+        try:
+            yield self._collected
+        finally:
+            self._collected = None
+
+    def _put(self, text: str) -> str:
+        return self.store.put(text)
+
+    def _get(self, key: str) -> str:
+        if self._collected is not None:
+            self._collected.add(key)
+        return self.store.get(key)
+
+    def _externalize(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return BLOB_PREFIX + self._put(value) if len(value) >= self.min_chars else value
+        if isinstance(value, BaseMessage):
+            if isinstance(value.content, str) and len(value.content) >= self.min_chars:
+                return value.model_copy(update={"content": BLOB_PREFIX + self._put(value.content)})
+            return value
+        # Solo se reemplazan hojas de texto: listas, tuplas y diccionarios conservan su tipo y sus claves
+        if type(value) in (list, tuple):
+            return type(value)(self._externalize(item) for item in value)
+        if isinstance(value, dict):
+            return {key: self._externalize(item) for key, item in value.items()}
+        return value
+
+    def _restore(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self._get(value[len(BLOB_PREFIX):]) if value.startswith(BLOB_PREFIX) else value
+        if isinstance(value, BaseMessage):
+            if isinstance(value.content, str) and value.content.startswith(BLOB_PREFIX):
+                return value.model_copy(update={"content": self._get(value.content[len(BLOB_PREFIX):])})
+            return value
+        if type(value) in (list, tuple):
+            return type(value)(self._restore(item) for item in value)
+        if isinstance(value, dict):
+            if len(value) == 1 and BLOB_KEY in value:
+                # Artefacto completo guardado por versiones anteriores de este serializador
+                return json.loads(self._get(value[BLOB_KEY]))
+            return {key: self._restore(item) for key, item in value.items()}
+        return value
+
+    def dumps_typed(self, obj: Any) -> tuple:
+        if isinstance(obj, dict) and "channel_values" in obj:
+            # Checkpoint completo: solo se externalizan los valores de los canales
+            obj = {**obj, "channel_values": {key: self._externalize(value) for key, value in obj["channel_values"].items()}}
+        else:
+            obj = self._externalize(obj)
+        return self.inner.dumps_typed(obj)
+
+    def loads_typed(self, data: tuple) -> Any:
+        obj = self.inner.loads_typed(data)
+        if isinstance(obj, dict) and "channel_values" in obj:
+            return {**obj, "channel_values": {key: self._restore(value) for key, value in obj["channel_values"].items()}}
+        return self._restore(obj)
+
+
+async def compact(checkpointer, serde: ExternalizingSerializer, idle_seconds: float = None, grace_seconds: float = 3600) -> dict:
+    """
+    Limpieza de checkpoints y blobs:
+    borra los hilos sin actividad desde hace idle_seconds (si se indica) y después los blobs
+    que ya no referencia ningún checkpoint. Los blobs usados en la última grace_seconds se conservan
+    para no competir con escrituras en curso.
+    """
+    latest = {}
+    async for checkpoint_tuple in checkpointer.alist(None):
+        thread_id = checkpoint_tuple.config["configurable"]["thread_id"]
+        ts = checkpoint_tuple.checkpoint["ts"]
+        latest[thread_id] = max(latest.get(thread_id, ts), ts)
+
+    deleted_threads = 0
+    if idle_seconds is not None:
+        now = time.time()
+        for thread_id, ts in latest.items():
+            # ts es una fecha ISO 8601 con zona horaria
+            if now - datetime.fromisoformat(ts).timestamp() > idle_seconds:
+                await checkpointer.adelete_thread(thread_id)
+                deleted_threads += 1
+
+    with serde.collect_references() as referenced:
+        async for _ in checkpointer.alist(None):
+            pass
+
+    deleted_blobs = 0
+    cutoff = time.time() - grace_seconds
+    for key, used_at in list(serde.store.keys()):
+        if key not in referenced and used_at < cutoff:
+            serde.store.delete(key)
+            deleted_blobs += 1
+
+    return {"deleted_threads": deleted_threads, "deleted_blobs": deleted_blobs, "referenced_blobs": len(referenced)}
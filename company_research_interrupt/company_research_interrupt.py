@@ -34,5 +34,6 @@ workflow.add_edge("human_review", "generate_report")
 workflow.add_edge("generate_report", END)
 
 # Add memory
+# For durable sessions compile the workflow with checkpointing.open_checkpointer() instead
 memory = MemorySaver()
 graph = workflow.compile(checkpointer=memory)
\ No newline at end of file
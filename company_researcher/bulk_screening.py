@@ -0,0 +1,119 @@
+"""
+Rescreening masivo de una cartera de clientes contra el dataset de sanciones.
+Solo usa el índice local de sanciones: no hace búsquedas web ni llama al modelo.
+
+Uso:
+    python company_researcher/bulk_screening.py clientes.csv --column nombre --output screening.jsonl --workers 4
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, Optional
+
+# Añadir el directorio raíz al PYTHONPATH
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from company_researcher.sanctions import SANCTIONS_XML, load_sanctions_index
+
+# Cada cuántos nombres se informa del avance
+PROGRESS_EVERY = 1000
+
+
+def read_names(path: str, column: str) -> Iterator[Dict]:
+    """Lee los registros de un CSV o JSONL; cada registro debe tener el nombre en column."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as file:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in file if line.strip())
+        else:
+            rows = csv.DictReader(file)
+        for line_number, row in enumerate(rows, 1):
+            name = (row.get(column) or "").strip()
+            if not name:
+                print(f"⚠️  Registro {line_number} sin '{column}', se omite")
+                continue
+            yield row
+
+
+def _init_worker(xml_path: str):
+    # Con fork el índice ya cargado por el proceso principal se hereda y no se vuelve a construir
+    load_sanctions_index(xml_path)
+
+
+def screen_record(job) -> Dict:
+    row, column, xml_path = job
+    matches = load_sanctions_index(xml_path).screen(row[column].strip())
+    return {
+        "name": row[column].strip(),
+        "record": row,
+        "total_matches": len(matches),
+        "matches": matches
+    }
+
+
+def screen_portfolio(input_path: str, output_path: str, column: str = "name", xml_path: str = SANCTIONS_XML,
+                     workers: Optional[int] = None, matches_only: bool = False, chunksize: int = 64) -> Dict:
+    """
+    Compara todos los nombres de input_path contra el índice de sanciones y escribe un
+    resultado JSONL por nombre a medida que se obtienen, en el mismo orden de la entrada.
+    """
+    index = load_sanctions_index(xml_path)
+    workers = workers or os.cpu_count() or 1
+    jobs = ((row, column, xml_path) for row in read_names(input_path, column))
+    stats = {"screened": 0, "with_matches": 0, "total_entities": index.total_entities}
+    started = time.monotonic()
+
+    pool = Pool(workers, initializer=_init_worker, initargs=(xml_path,)) if workers > 1 else None
+    try:
+        results = pool.imap(screen_record, jobs, chunksize=chunksize) if pool else map(screen_record, jobs)
+        with open(output_path, "w", encoding="utf-8") as output:
+            for result in results:
+                stats["screened"] += 1
+                if result["total_matches"]:
+                    stats["with_matches"] += 1
+                if result["total_matches"] or not matches_only:
+                    output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                if stats["screened"] % PROGRESS_EVERY == 0:
+                    elapsed = time.monotonic() - started
+                    print(f"🔎 {stats['screened']} nombres | {stats['with_matches']} con coincidencias | "
+                          f"{stats['screened'] / elapsed:.0f} nombres/s")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    elapsed = time.monotonic() - started
+    stats["elapsed_seconds"] = round(elapsed, 2)
+    stats["names_per_second"] = round(stats["screened"] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compara una cartera de nombres contra el dataset de sanciones.")
+    parser.add_argument("input", help="Archivo CSV o JSONL con los nombres a revisar")
+    parser.add_argument("--column", default="name", help="Columna o campo con el nombre (por defecto name)")
+    parser.add_argument("--output", default="screening.jsonl", help="Archivo JSONL de resultados")
+    parser.add_argument("--xml", default=SANCTIONS_XML, help="Publicación de sanciones a usar")
+    parser.add_argument("--workers", type=int, default=0, help="Procesos de comparación (0 = uno por CPU)")
+    parser.add_argument("--matches-only", action="store_true", help="Escribir solo los nombres con coincidencias")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    stats = screen_portfolio(
+        args.input, args.output, column=args.column, xml_path=args.xml,
+        workers=args.workers or None, matches_only=args.matches_only
+    )
+    print(
+        f"\n📊 Revisados: {stats['screened']} | Con coincidencias: {stats['with_matches']} | "
+        f"{stats['elapsed_seconds']}s | {stats['names_per_second']} nombres/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
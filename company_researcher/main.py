@@ -3,7 +3,7 @@ from datetime import datetime
 from tavily import AsyncTavilyClient
 import json
 import asyncio
-import xml.etree.ElementTree as ET
+import sys
 from langchain_openai.chat_models.base import BaseChatOpenAI
 from langchain_core.messages import AnyMessage, AIMessage, SystemMessage, ToolMessage
 from pydantic import BaseModel, Field
@@ -12,6 +12,13 @@ from langgraph.graph import StateGraph, START, END, add_messages
 import os
 from dotenv import load_dotenv
 
+# Añadir el directorio raíz al PYTHONPATH cuando este archivo se ejecuta directamente
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+from company_researcher.sanctions import load_sanctions_index
+
 load_dotenv()
 
 # Define the research state
@@ -55,61 +62,6 @@ class TavilyQuery(BaseModel):
 class TavilySearchInput(BaseModel):
     sub_queries: List[TavilyQuery] = Field(description="set of sub-queries that can be answered in isolation")
 
-# Función para normalizar nombres
-def normalize_name(name):
-    """Normaliza un nombre para comparación"""
-    return (name.lower()
-            .replace(",", "")
-            .replace(".", "")
-            .replace("-", " ")
-            .replace("_", " ")
-            .replace("  ", " ")
-            .strip())
-
-# Función para comparar nombres
-def names_match(name1, name2):
-    """
-    Compara dos nombres con lógica flexible para manejar nombres parciales.
-    Retorna (bool, float) donde bool indica si hay coincidencia y float es el score.
-    """
-    name1 = normalize_name(name1)
-    name2 = normalize_name(name2)
-    
-    # Dividir los nombres en partes
-    parts1 = set(name1.split())
-    parts2 = set(name2.split())
-    
-    # Si alguno de los nombres tiene una sola palabra, ser más flexible
-    if len(parts1) == 1 or len(parts2) == 1:
-        # Si una palabra está completamente contenida en la otra
-        for part in parts1:
-            for other_part in parts2:
-                if part in other_part or other_part in part:
-                    return True
-        return False
-    
-    # Calcular la intersección y unión de palabras
-    common_parts = parts1.intersection(parts2)
-    all_parts = parts1.union(parts2)
-    
-    # Calcular similitud de Jaccard
-    similarity = len(common_parts) / len(all_parts) if all_parts else 0
-    
-    # Criterios de coincidencia:
-    # 1. Al menos 2 palabras en común
-    # 2. O una similitud de Jaccard alta (>0.5) si hay menos palabras
-    if len(common_parts) >= 2 or similarity > 0.5:
-        return True
-    
-    # Verificar si las palabras son substrings una de otra
-    for part1 in parts1:
-        for part2 in parts2:
-            if len(part1) >= 4 and len(part2) >= 4:  # Solo para palabras suficientemente largas
-                if part1 in part2 or part2 in part1:
-                    return True
-    
-    return False
-
 @tool("analyze_sanctions_data", return_direct=True)
 async def analyze_sanctions_data(company_name: str) -> Dict:
     """
@@ -122,134 +74,20 @@ async def analyze_sanctions_data(company_name: str) -> Dict:
         Dict: Analysis results including potential matches and risk factors
     """
     try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        xml_path = os.path.join(current_dir, 'CustomizeSanctionsDataset.xml')
-        print(f"Buscando archivo XML en: {xml_path}")
-        
-        if not os.path.exists(xml_path):
-            raise FileNotFoundError(f"No se encontró el archivo XML en: {xml_path}")
-        
-        file_size = os.path.getsize(xml_path)
-        print(f"Tamaño del archivo XML: {file_size / (1024*1024):.2f} MB")
-        
-        print("Iniciando parseo del archivo XML...")
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        
-        # Obtener el namespace
-        default_ns = root.tag.split('}')[0].strip('{') if '}' in root.tag else ''
-        ns = {'ns': default_ns} if default_ns else {}
-        
-        print(f"Buscando entidades...")
-        entities = root.findall(f'.//{{{default_ns}}}entities/{{{default_ns}}}entity', {})
-        if not entities:
-            print("No se encontraron entidades, intentando patrón alternativo...")
-            entities = root.findall('.//entity', {})
-        
-        if not entities:
-            raise ValueError("No se encontraron entidades en el archivo XML")
-        
-        print(f"Encontradas {len(entities)} entidades")
+        index = load_sanctions_index()
+
         print(f"Analizando coincidencias para: {company_name}")
-        matches = []
-        
-        for entity in entities:
-            try:
-                names_element = entity.find(f'.//{{{default_ns}}}names', {})
-                if names_element is None:
-                    continue
-                
-                entity_names = []
-                
-                # Procesar cada entrada de nombre
-                for name_entry in names_element.findall(f'.//{{{default_ns}}}name', {}):
-                    translations = name_entry.find(f'.//{{{default_ns}}}translations', {})
-                    if translations is None:
-                        continue
-                    
-                    # Procesar cada traducción
-                    for translation in translations.findall(f'.//{{{default_ns}}}translation', {}):
-                        # Obtener el nombre completo formateado
-                        formatted_name = translation.find(f'.//{{{default_ns}}}formattedFullName', {})
-                        if formatted_name is not None and formatted_name.text:
-                            entity_names.append(formatted_name.text)
-                        
-                        # También obtener partes individuales del nombre
-                        name_parts = translation.find(f'.//{{{default_ns}}}nameParts', {})
-                        if name_parts is not None:
-                            for part in name_parts.findall(f'.//{{{default_ns}}}namePart', {}):
-                                value = part.find(f'.//{{{default_ns}}}value', {})
-                                if value is not None and value.text:
-                                    entity_names.append(value.text)
-                
-                # Eliminar duplicados y nombres vacíos
-                entity_names = list(set(filter(None, entity_names)))
-                
-                # Buscar coincidencias
-                for name in entity_names:
-                    if names_match(name, company_name):
-                        print(f"\n¡Coincidencia encontrada!")
-                        print(f"Nombre en lista: {name}")
-                        print(f"Nombres asociados: {entity_names}")
-                        
-                        # Recopilar detalles
-                        details = {
-                            "entity_name": name,
-                            "all_names": entity_names,
-                            "match_score": 1.0,
-                            "sanctions_details": {
-                                "programs": [],
-                                "addresses": [],
-                                "id_numbers": [],
-                                "additional_info": {}
-                            }
-                        }
-                        
-                        # Obtener programas
-                        programs = entity.find(f'.//{{{default_ns}}}sanctionsPrograms', {})
-                        if programs is not None:
-                            for program in programs.findall(f'.//{{{default_ns}}}program', {}):
-                                value = program.find(f'.//{{{default_ns}}}value', {})
-                                if value is not None and value.text:
-                                    details["sanctions_details"]["programs"].append(value.text)
-                        
-                        # Obtener direcciones
-                        addresses = entity.find(f'.//{{{default_ns}}}addresses', {})
-                        if addresses is not None:
-                            for address in addresses.findall(f'.//{{{default_ns}}}address', {}):
-                                value = address.find(f'.//{{{default_ns}}}value', {})
-                                if value is not None and value.text:
-                                    details["sanctions_details"]["addresses"].append(value.text)
-                        
-                        # Obtener documentos de identidad
-                        documents = entity.find(f'.//{{{default_ns}}}identityDocuments', {})
-                        if documents is not None:
-                            for doc in documents.findall(f'.//{{{default_ns}}}identityDocument', {}):
-                                value = doc.find(f'.//{{{default_ns}}}value', {})
-                                if value is not None and value.text:
-                                    details["sanctions_details"]["id_numbers"].append(value.text)
-                        
-                        # Obtener información general
-                        general_info = entity.find(f'.//{{{default_ns}}}generalInfo', {})
-                        if general_info is not None:
-                            details["sanctions_details"]["additional_info"] = {
-                                "type": general_info.findtext(f'.//{{{default_ns}}}type', ""),
-                                "category": general_info.findtext(f'.//{{{default_ns}}}category', ""),
-                                "status": general_info.findtext(f'.//{{{default_ns}}}status', "")
-                            }
-                        
-                        matches.append(details)
-                        break  # Salir después de encontrar una coincidencia para esta entidad
-            
-            except Exception as e:
-                print(f"Error procesando entidad: {e}")
-                continue
-        
+        matches = index.screen(company_name)
+        for match in matches:
+            print(f"\n¡Coincidencia encontrada!")
+            print(f"Nombre en lista: {match['entity_name']}")
+            print(f"Nombres asociados: {match['all_names']}")
+
         print(f"\nAnálisis completado. Se encontraron {len(matches)} coincidencias")
         return {
             "matches": matches,
             "total_matches": len(matches),
-            "total_entries_analyzed": len(entities)
+            "total_entries_analyzed": index.total_entities
         }
         
     except Exception as e:
@@ -0,0 +1,588 @@
+"""
+Índice del dataset de sanciones (OFAC ENHANCED_XML) y comparación de nombres.
+No depende del modelo ni de servicios externos, así se puede usar también desde procesos en lote.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from array import array
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Dict, List, Optional
+
+# Función para normalizar nombres
+def normalize_name(name):
+    """Normaliza un nombre para comparación"""
+    return (name.lower()
+            .replace(",", "")
+            .replace(".", "")
+            .replace("-", " ")
+            .replace("_", " ")
+            .replace("  ", " ")
+            .strip())
+
+# Función para comparar nombres
+def names_match(name1, name2):
+    """
+    Compara dos nombres con lógica flexible para manejar nombres parciales.
+    Retorna (bool, float) donde bool indica si hay coincidencia y float es el score.
+    """
+    name1 = normalize_name(name1)
+    name2 = normalize_name(name2)
+    
+    # Dividir los nombres en partes
+    parts1 = set(name1.split())
+    parts2 = set(name2.split())
+    
+    # Si alguno de los nombres tiene una sola palabra, ser más flexible
+    if len(parts1) == 1 or len(parts2) == 1:
+        # Si una palabra está completamente contenida en la otra
+        for part in parts1:
+            for other_part in parts2:
+                if part in other_part or other_part in part:
+                    return True
+        return False
+    
+    # Calcular la intersección y unión de palabras
+    common_parts = parts1.intersection(parts2)
+    all_parts = parts1.union(parts2)
+    
+    # Calcular similitud de Jaccard
+    similarity = len(common_parts) / len(all_parts) if all_parts else 0
+    
+    # Criterios de coincidencia:
+    # 1. Al menos 2 palabras en común
+    # 2. O una similitud de Jaccard alta (>0.5) si hay menos palabras
+    if len(common_parts) >= 2 or similarity > 0.5:
+        return True
+    
+    # Verificar si las palabras son substrings una de otra
+    for part1 in parts1:
+        for part2 in parts2:
+            if len(part1) >= 4 and len(part2) >= 4:  # Solo para palabras suficientemente largas
+                if part1 in part2 or part2 in part1:
+                    return True
+    
+    return False
+
+# Ruta del dataset de sanciones; se puede apuntar a otra publicación con SANCTIONS_XML_PATH
+SANCTIONS_XML = os.getenv(
+    "SANCTIONS_XML_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'CustomizeSanctionsDataset.xml')
+)
+
+
+def _extract_entity(entity, default_ns: str) -> Optional[Dict]:
+    """Extrae de un elemento <entity> sus nombres y los detalles de sanciones que se reportan en cada coincidencia."""
+    names_element = entity.find(f'.//{{{default_ns}}}names', {})
+    if names_element is None:
+        return None
+
+    entity_names = []
+
+    # Procesar cada entrada de nombre
+    for name_entry in names_element.findall(f'.//{{{default_ns}}}name', {}):
+        translations = name_entry.find(f'.//{{{default_ns}}}translations', {})
+        if translations is None:
+            continue
+
+        # Procesar cada traducción
+        for translation in translations.findall(f'.//{{{default_ns}}}translation', {}):
+            # Obtener el nombre completo formateado
+            formatted_name = translation.find(f'.//{{{default_ns}}}formattedFullName', {})
+            if formatted_name is not None and formatted_name.text:
+                entity_names.append(formatted_name.text)
+
+            # También obtener partes individuales del nombre
+            name_parts = translation.find(f'.//{{{default_ns}}}nameParts', {})
+            if name_parts is not None:
+                for part in name_parts.findall(f'.//{{{default_ns}}}namePart', {}):
+                    value = part.find(f'.//{{{default_ns}}}value', {})
+                    if value is not None and value.text:
+                        entity_names.append(value.text)
+
+    details = {
+        "programs": [],
+        "addresses": [],
+        "id_numbers": [],
+        "additional_info": {}
+    }
+
+    # Obtener programas
+    programs = entity.find(f'.//{{{default_ns}}}sanctionsPrograms', {})
+    if programs is not None:
+        for program in programs.findall(f'.//{{{default_ns}}}program', {}):
+            value = program.find(f'.//{{{default_ns}}}value', {})
+            if value is not None and value.text:
+                details["programs"].append(value.text)
+
+    # Obtener direcciones
+    addresses = entity.find(f'.//{{{default_ns}}}addresses', {})
+    if addresses is not None:
+        for address in addresses.findall(f'.//{{{default_ns}}}address', {}):
+            value = address.find(f'.//{{{default_ns}}}value', {})
+            if value is not None and value.text:
+                details["addresses"].append(value.text)
+
+    # Obtener documentos de identidad
+    documents = entity.find(f'.//{{{default_ns}}}identityDocuments', {})
+    if documents is not None:
+        for doc in documents.findall(f'.//{{{default_ns}}}identityDocument', {}):
+            value = doc.find(f'.//{{{default_ns}}}value', {})
+            if value is not None and value.text:
+                details["id_numbers"].append(value.text)
+
+    # Obtener información general
+    general_info = entity.find(f'.//{{{default_ns}}}generalInfo', {})
+    if general_info is not None:
+        details["additional_info"] = {
+            "type": general_info.findtext(f'.//{{{default_ns}}}type', ""),
+            "category": general_info.findtext(f'.//{{{default_ns}}}category', ""),
+            "status": general_info.findtext(f'.//{{{default_ns}}}status', "")
+        }
+
+    return {
+        # Eliminar duplicados y nombres vacíos
+        "names": list(set(filter(None, entity_names))),
+        "sanctions_details": details
+    }
+
+
+# Longitud máxima de los fragmentos de palabra indexados para la regla de subcadenas de names_match
+NGRAM_SIZE = 3
+
+# Caché binaria del índice ya extraído, compartida entre procesos; SANCTIONS_CACHE=0 la desactiva
+SANCTIONS_CACHE = os.getenv("SANCTIONS_CACHE", "1") != "0"
+SANCTIONS_CACHE_DIR = os.getenv(
+    "SANCTIONS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "company_researcher")
+)
+# Cambiar al modificar la extracción de entidades o el formato del índice
+CACHE_VERSION = 2
+CACHE_MAGIC = b"SANCIDX\0"
+
+
+def _publication_info(xml_path: str) -> tuple:
+    """sha256 del XML y fecha dataAsOf de la publicación, que identifican su caché."""
+    digest = hashlib.sha256()
+    with open(xml_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    data_as_of = ""
+    # dataAsOf está al principio, dentro de publicationInfo
+    for _, elem in ET.iterparse(xml_path, events=("end",)):
+        if elem.tag.endswith("dataAsOf"):
+            data_as_of = (elem.text or "").strip()
+            break
+        if elem.tag.endswith(("publicationInfo", "entity")):
+            break
+    return digest.hexdigest(), data_as_of
+
+
+def _array_section(typecode: str, values) -> bytes:
+    return array(typecode, values).tobytes()
+
+
+def _pack_strings(keys: List[str]) -> Dict[str, bytes]:
+    """Claves en UTF-8 con su tabla de desplazamientos y una tabla hash de direccionamiento abierto."""
+    encoded = [key.encode("utf-8") for key in keys]
+    offsets = [0]
+    for key in encoded:
+        offsets.append(offsets[-1] + len(key))
+    size = 8
+    while size < 2 * len(keys):
+        size *= 2
+    # Cada casilla guarda la posición de la clave más uno; 0 es una casilla vacía
+    table = [0] * size
+    for position, key in enumerate(encoded):
+        slot = zlib.crc32(key) & (size - 1)
+        while table[slot]:
+            slot = (slot + 1) & (size - 1)
+        table[slot] = position + 1
+    return {
+        "key_offsets": _array_section("Q", offsets),
+        "keys": b"".join(encoded),
+        "table": _array_section("I", table),
+    }
+
+
+def _pack_postings(lists: List[List[int]]) -> Dict[str, bytes]:
+    offsets = [0]
+    for values in lists:
+        offsets.append(offsets[-1] + len(values))
+    return {
+        "offsets": _array_section("Q", offsets),
+        "values": _array_section("I", (value for values in lists for value in values)),
+    }
+
+
+class _Strings:
+    """Conjunto de cadenas guardado en el búfer del índice: posición de cada clave y clave de cada posición."""
+
+    def __init__(self, key_offsets, keys, table):
+        self._key_offsets = key_offsets
+        self._keys = keys
+        self._table = table
+        self._mask = len(table) - 1
+
+    def __len__(self):
+        return len(self._key_offsets) - 1
+
+    def _key_bytes(self, position: int) -> bytes:
+        return self._keys[self._key_offsets[position]:self._key_offsets[position + 1]]
+
+    def key(self, position: int) -> str:
+        return bytes(self._key_bytes(position)).decode("utf-8")
+
+    def find(self, key: str) -> int:
+        """Posición de la clave o -1 si no está."""
+        encoded = key.encode("utf-8")
+        slot = zlib.crc32(encoded) & self._mask
+        while self._table[slot]:
+            position = self._table[slot] - 1
+            if self._key_bytes(position) == encoded:
+                return position
+            slot = (slot + 1) & self._mask
+        return -1
+
+
+class _Postings:
+    """Listas ordenadas de enteros guardadas una tras otra en el búfer del índice."""
+
+    def __init__(self, offsets, values):
+        self._offsets = offsets
+        self._values = values
+
+    def __getitem__(self, position: int):
+        return self._values[self._offsets[position]:self._offsets[position + 1]]
+
+
+class _MappedEntities(Sequence):
+    """Registros de entidades guardados en el búfer del índice; se decodifican al accederlos."""
+
+    def __init__(self, offsets, records):
+        self._offsets = offsets
+        self._records = records
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return json.loads(bytes(self._records[self._offsets[i]:self._offsets[i + 1]]))
+
+
+def _pack_index(records: List[Dict], header: Dict) -> bytes:
+    """
+    Serializa las entidades y su índice de palabras en un único búfer: cabecera JSON con la
+    ubicación de cada sección y, detrás, las secciones alineadas a 8 bytes.
+    """
+    # Palabra normalizada -> entidades que la usan en algún nombre
+    token_entities = defaultdict(set)
+    # Palabra -> entidades con un nombre de una sola palabra igual a ella
+    single_entities = defaultdict(set)
+    for entity_id, entity in enumerate(records):
+        for name in entity["names"]:
+            parts = set(normalize_name(name).split())
+            for part in parts:
+                token_entities[part].add(entity_id)
+            if len(parts) == 1:
+                single_entities[next(iter(parts))].add(entity_id)
+    tokens = sorted(token_entities)
+    # Subcadena de 1 a NGRAM_SIZE caracteres -> palabras que la contienen
+    gram_tokens = defaultdict(set)
+    for token_id, token in enumerate(tokens):
+        for size in range(1, NGRAM_SIZE + 1):
+            for start in range(len(token) - size + 1):
+                gram_tokens[token[start:start + size]].add(token_id)
+    grams = sorted(gram_tokens)
+
+    payloads = [json.dumps(entity, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for entity in records]
+    record_offsets = [0]
+    for payload in payloads:
+        record_offsets.append(record_offsets[-1] + len(payload))
+
+    sections = {
+        "record_offsets": _array_section("Q", record_offsets),
+        "records": b"".join(payloads),
+    }
+    sections.update({f"token_{name}": data for name, data in _pack_strings(tokens).items()})
+    sections.update({f"gram_{name}": data for name, data in _pack_strings(grams).items()})
+    sections.update({f"entities_{name}": data for name, data in _pack_postings([sorted(token_entities[token]) for token in tokens]).items()})
+    sections.update({f"single_{name}": data for name, data in _pack_postings([sorted(single_entities.get(token, ())) for token in tokens]).items()})
+    sections.update({f"gram_tokens_{name}": data for name, data in _pack_postings([sorted(gram_tokens[gram]) for gram in grams]).items()})
+
+    layout = {}
+    position = 0
+    for name, data in sections.items():
+        layout[name] = [position, len(data)]
+        position += len(data) + (-len(data) % 8)
+    parts = [_header_bytes({**header, "entities": len(records), "sections": layout})]
+    for data in sections.values():
+        parts += [data, b"\0" * (-len(data) % 8)]
+    return b"".join(parts)
+
+
+def _header_bytes(header: Dict) -> bytes:
+    """Firma, longitud y cabecera JSON, rellenadas hasta múltiplo de 8 bytes."""
+    encoded = json.dumps({**header, "version": CACHE_VERSION}).encode("utf-8")
+    size = len(CACHE_MAGIC) + 4 + len(encoded)
+    return CACHE_MAGIC + struct.pack("<I", len(encoded)) + encoded + b"\0" * (-size % 8)
+
+
+def _read_header(buffer) -> Dict:
+    if bytes(buffer[:len(CACHE_MAGIC)]) != CACHE_MAGIC:
+        raise ValueError("El búfer no contiene un índice de sanciones")
+    (header_size,) = struct.unpack_from("<I", buffer, len(CACHE_MAGIC))
+    header_start = len(CACHE_MAGIC) + 4
+    header = json.loads(bytes(buffer[header_start:header_start + header_size]))
+    if header.get("version") != CACHE_VERSION:
+        raise ValueError(f"Índice de sanciones de otra versión: {header.get('version')}")
+    data_start = header_start + header_size
+    header["data_start"] = data_start + (-data_start % 8)
+    return header
+
+
+class SanctionsIndex:
+    """
+    Entidades del dataset de sanciones ya extraídas del XML, listas para comparar nombres
+    sin volver a recorrer el árbol en cada consulta.
+
+    Todo el índice (registros, palabras, fragmentos y listas de entidades) vive en un único búfer
+    de solo lectura. Abierto con mmap desde la caché, sus páginas se comparten entre todos los
+    procesos que usan la misma publicación.
+    """
+
+    def __init__(self, path: str, mtime: float, buffer):
+        self.path = path
+        self.mtime = mtime
+        self._buffer = buffer
+        header = _read_header(buffer)
+        self.header = header
+        self.total_entities = header["total_entities"]
+        self.data_as_of = header.get("data_as_of", "")
+
+        view = memoryview(buffer)
+
+        def section(name: str, typecode: str = None):
+            offset, length = header["sections"][name]
+            data = view[header["data_start"] + offset:header["data_start"] + offset + length]
+            return data.cast(typecode) if typecode else data
+
+        self.entities = _MappedEntities(section("record_offsets", "Q"), section("records"))
+        self._tokens = _Strings(section("token_key_offsets", "Q"), section("token_keys"), section("token_table", "I"))
+        self._grams = _Strings(section("gram_key_offsets", "Q"), section("gram_keys"), section("gram_table", "I"))
+        self._token_entities = _Postings(section("entities_offsets", "Q"), section("entities_values", "I"))
+        self._single_entities = _Postings(section("single_offsets", "Q"), section("single_values", "I"))
+        self._gram_tokens = _Postings(section("gram_tokens_offsets", "Q"), section("gram_tokens_values", "I"))
+
+    @classmethod
+    def from_records(cls, records: List[Dict], total_entities: int, path: str = "", mtime: float = 0.0,
+                     **header) -> "SanctionsIndex":
+        """Construye el índice en memoria a partir de entidades ya extraídas."""
+        return cls(path, mtime, _pack_index(records, {**header, "total_entities": total_entities}))
+
+    def _related_tokens(self, part: str) -> set:
+        """Palabras del índice (por posición) que contienen a part o están contenidas en ella."""
+        if len(part) <= NGRAM_SIZE:
+            gram = self._grams.find(part)
+            related = set(self._gram_tokens[gram]) if gram >= 0 else set()
+        else:
+            postings = []
+            for i in range(len(part) - NGRAM_SIZE + 1):
+                gram = self._grams.find(part[i:i + NGRAM_SIZE])
+                if gram < 0:
+                    postings = []
+                    break
+                postings.append(self._gram_tokens[gram])
+            related = set()
+            if postings:
+                postings.sort(key=len)
+                common = set(postings[0])
+                for values in postings[1:]:
+                    common.intersection_update(values)
+                related = {token for token in common if part in self._tokens.key(token)}
+        for start in range(len(part)):
+            for end in range(start + 1, len(part) + 1):
+                token = self._tokens.find(part[start:end])
+                if token >= 0:
+                    related.add(token)
+        return related
+
+    def candidates(self, company_name: str) -> List[int]:
+        """
+        Entidades que pueden coincidir según names_match: comparten una palabra con la consulta
+        o tienen una palabra que contiene a otra de la consulta (o está contenida en ella).
+        """
+        parts = set(normalize_name(company_name).split())
+        single_word_query = len(parts) == 1
+        found = set()
+        for part in parts:
+            token = self._tokens.find(part)
+            if token >= 0:
+                found.update(self._token_entities[token])
+            for token in self._related_tokens(part):
+                # Entre nombres de varias palabras la regla de subcadenas solo aplica a palabras de 4 o más letras
+                if single_word_query or (len(part) >= 4 and len(self._tokens.key(token)) >= 4):
+                    found.update(self._token_entities[token])
+                else:
+                    found.update(self._single_entities[token])
+        return sorted(found)
+
+    @classmethod
+    def from_xml(cls, xml_path: str, **header) -> "SanctionsIndex":
+        """
+        Lee la publicación en una sola pasada con iterparse: cada <entity> se extrae al cerrarse
+        y se descarta del árbol, así la memoria no crece con el tamaño del XML.
+        header se guarda junto al índice para validar después la caché.
+        """
+        mtime = os.path.getmtime(xml_path)
+        records = []
+        total_entities = 0
+        data_as_of = ""
+        default_ns = None
+        entity_tags = set()
+        # Elementos abiertos desde la raíz hasta el actual
+        open_elements = []
+
+        for event, elem in ET.iterparse(xml_path, events=("start", "end")):
+            if event == "start":
+                if default_ns is None:
+                    # Obtener el namespace de la raíz
+                    default_ns = elem.tag.split('}')[0].strip('{') if '}' in elem.tag else ''
+                    entity_tags = {f'{{{default_ns}}}entity' if default_ns else 'entity', 'entity'}
+                open_elements.append(elem)
+                continue
+
+            open_elements.pop()
+            if elem.tag.endswith("dataAsOf") and not data_as_of:
+                data_as_of = (elem.text or "").strip()
+            if elem.tag in entity_tags:
+                total_entities += 1
+                try:
+                    record = _extract_entity(elem, default_ns)
+                except Exception as e:
+                    print(f"Error procesando entidad: {e}")
+                    record = None
+                if record is not None:
+                    records.append(record)
+                elem.clear()
+                if open_elements:
+                    open_elements[-1].remove(elem)
+            elif len(open_elements) == 1:
+                # Sección de primer nivel terminada (publicationInfo, referenceValues, entities)
+                open_elements[0].clear()
+
+        if not total_entities:
+            raise ValueError("No se encontraron entidades en el archivo XML")
+
+        header.setdefault("data_as_of", data_as_of)
+        return cls.from_records(records, total_entities, xml_path, mtime, **header)
+
+    def write_cache(self, cache_path: str, **header):
+        """Guarda el índice en cache_path con una escritura atómica; header actualiza campos de la cabecera."""
+        header = {key: value for key, value in {**self.header, **header}.items() if key != "data_start"}
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(_header_bytes(header))
+            file.write(memoryview(self._buffer)[self.header["data_start"]:])
+        # Otro proceso nunca ve un archivo a medias
+        os.replace(tmp_path, cache_path)
+
+    @classmethod
+    def from_cache(cls, cache_path: str, xml_path: str, mtime: float) -> "SanctionsIndex":
+        """Abre la caché con mmap, sin copiar su contenido a la memoria del proceso."""
+        with open(cache_path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(xml_path, mtime, buffer)
+
+    def screen(self, company_name: str) -> List[Dict]:
+        """Devuelve una coincidencia por cada entidad con algún nombre que coincida con company_name."""
+        matches = []
+        for entity_id in self.candidates(company_name):
+            entity = self.entities[entity_id]
+            for name in entity["names"]:
+                if names_match(name, company_name):
+                    matches.append({
+                        "entity_name": name,
+                        "all_names": entity["names"],
+                        "match_score": 1.0,
+                        # Cada acceso decodifica el registro de nuevo, no hace falta copiarlo
+                        "sanctions_details": entity["sanctions_details"]
+                    })
+                    break  # Salir después de encontrar una coincidencia para esta entidad
+        return matches
+
+
+_sanctions_index: Optional[SanctionsIndex] = None
+_sanctions_lock = threading.Lock()
+
+
+def _open_index(xml_path: str) -> SanctionsIndex:
+    """
+    Abre el índice desde la caché binaria de esta publicación o, si no existe o es de otra
+    publicación, lo construye y la reescribe.
+
+    La caché de cada XML guarda su tamaño y fecha de modificación: si coinciden se usa sin leer
+    el XML. Si no, se compara el sha256 y el dataAsOf antes de reconstruirla.
+    """
+    if not SANCTIONS_CACHE:
+        return SanctionsIndex.from_xml(xml_path)
+    stat = os.stat(xml_path)
+    path_key = hashlib.sha256(os.path.abspath(xml_path).encode("utf-8")).hexdigest()[:16]
+    cache_path = os.path.join(SANCTIONS_CACHE_DIR, f"sanctions-{path_key}-v{CACHE_VERSION}.idx")
+    publication = None
+    if os.path.exists(cache_path):
+        try:
+            index = SanctionsIndex.from_cache(cache_path, xml_path, stat.st_mtime)
+            header = index.header
+            if header.get("source_size") == stat.st_size and header.get("source_mtime_ns") == stat.st_mtime_ns:
+                return index
+            publication = _publication_info(xml_path)
+            if (header.get("sha256"), header.get("data_as_of")) == publication:
+                # Mismo contenido con otra fecha de modificación (copia, touch): basta con actualizarla
+                try:
+                    index.write_cache(cache_path, source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+                except OSError as e:
+                    print(f"No se pudo escribir la caché de sanciones: {e}")
+                return index
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            print(f"Caché de sanciones descartada: {e}")
+    sha256, data_as_of = publication or _publication_info(xml_path)
+    index = SanctionsIndex.from_xml(
+        xml_path, sha256=sha256, data_as_of=data_as_of,
+        source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns
+    )
+    try:
+        index.write_cache(cache_path)
+    except OSError as e:
+        print(f"No se pudo escribir la caché de sanciones: {e}")
+    return index
+
+
+def load_sanctions_index(xml_path: str = SANCTIONS_XML) -> SanctionsIndex:
+    """
+    Devuelve el índice de sanciones del proceso. Se carga en el primer uso (desde la caché
+    binaria si existe) y se vuelve a cargar solo si cambia el archivo o su fecha de modificación.
+    """
+    global _sanctions_index
+    if not os.path.exists(xml_path):
+        raise FileNotFoundError(f"No se encontró el archivo XML en: {xml_path}")
+    mtime = os.path.getmtime(xml_path)
+    with _sanctions_lock:
+        index = _sanctions_index
+        if index is None or index.path != xml_path or index.mtime != mtime:
+            print(f"Cargando dataset de sanciones: {xml_path} ({os.path.getsize(xml_path) / (1024*1024):.2f} MB)")
+            started = time.perf_counter()
+            index = _open_index(xml_path)
+            _sanctions_index = index
+            print(f"Índice de sanciones listo: {len(index.entities)} entidades en {time.perf_counter() - started:.2f}s")
+    return index
@@ -0,0 +1,164 @@
+"""
+Procesamiento nocturno de actas: recorre un directorio de transcripciones, ejecuta el grafo
+aprobando automáticamente los puntos clave y el acta, y escribe un resultado JSONL por reunión.
+
+Uso:
+    python -m meeting_minutes_agent.batch transcripciones/ --output actas.jsonl --concurrency 4
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+import traceback
+from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+load_dotenv()
+
+from meeting_minutes_agent.minutes_agent_cloud import graph
+from meeting_minutes_agent.nodes import nodes
+from meeting_minutes_agent.utils.docx_render import render_many
+from meeting_minutes_agent.utils.store import ContentStore
+
+
+def load_completed(output_path: str) -> set:
+    """Claves (archivo, hash) ya procesadas con éxito en una ejecución anterior."""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Última línea a medio escribir si el proceso se cortó
+                continue
+            if record.get("status") == "ok":
+                completed.add((record["file"], record["transcript_id"]))
+    return completed
+
+
+def list_transcripts(directory: str, pattern: str) -> list:
+    return sorted(path for path in glob.glob(os.path.join(directory, pattern)) if os.path.isfile(path))
+
+
+async def process_meeting(path: str, text: str, transcript_id: str, generation_mode: str) -> dict:
+    # Con ambas aprobaciones en el estado inicial el grafo pasa por los nodos human_* sin detenerse
+    initial_state = {
+        "messages": [HumanMessage(content=text)],
+        "keypoints_approved": True,
+        "minutes_approved": True
+    }
+    config = {"configurable": {"generation_mode": generation_mode}}
+    started = time.monotonic()
+    try:
+        result = await graph.ainvoke(initial_state, config)
+        return {
+            "file": path,
+            "transcript_id": transcript_id,
+            "status": "ok",
+            "keypoints": result.get("keypoints"),
+            "minutes": result.get("minutes"),
+            "validation_issues": result.get("validation_issues", []),
+            "llm_usage": result.get("llm_usage", []),
+            "seconds": round(time.monotonic() - started, 2)
+        }
+    except Exception as e:
+        return {
+            "file": path,
+            "transcript_id": transcript_id,
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+            "seconds": round(time.monotonic() - started, 2)
+        }
+
+
+async def run_batch(args) -> dict:
+    if args.requests_per_second:
+        # Un único limitador para todas las reuniones en curso, compartido por los dos modelos
+        rate_limiter = InMemoryRateLimiter(
+            requests_per_second=args.requests_per_second,
+            max_bucket_size=max(1, args.concurrency)
+        )
+        nodes.llm.rate_limiter = rate_limiter
+        nodes.fast_llm.rate_limiter = rate_limiter
+
+    completed = load_completed(args.output)
+    pending = []
+    for path in list_transcripts(args.directory, args.pattern):
+        with open(path, "r", encoding="utf-8") as file:
+            text = file.read()
+        if not text.strip():
+            print(f"⚠️  Transcripción vacía, se omite: {path}")
+            continue
+        transcript_id = ContentStore.key_for(text)
+        if (path, transcript_id) not in completed:
+            pending.append((path, text, transcript_id))
+
+    print(f"📂 {len(pending)} reuniones pendientes ({len(completed)} ya procesadas)")
+    semaphore = asyncio.Semaphore(args.concurrency)
+    write_lock = asyncio.Lock()
+    stats = {"ok": 0, "error": 0}
+    finished = []
+    started = time.monotonic()
+
+    with open(args.output, "a", encoding="utf-8") as output:
+        async def worker(path: str, text: str, transcript_id: str):
+            async with semaphore:
+                record = await process_meeting(path, text, transcript_id, args.mode)
+            async with write_lock:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+                os.fsync(output.fileno())
+                stats[record["status"]] += 1
+                if record["status"] == "ok":
+                    finished.append(record)
+                elapsed = time.monotonic() - started
+                rate = stats["ok"] / elapsed * 3600 if elapsed else 0.0
+                icon = "✅" if record["status"] == "ok" else "❌"
+                print(f"{icon} {path} ({record['seconds']}s) | {sum(stats.values())}/{len(pending)} | {rate:.1f} reuniones/hora")
+
+        await asyncio.gather(*(worker(*item) for item in pending))
+
+    if args.docx_dir and finished:
+        jobs = [
+            (record["minutes"], os.path.join(args.docx_dir, os.path.splitext(os.path.basename(record["file"]))[0] + ".docx"))
+            for record in finished
+        ]
+        rendered = await asyncio.to_thread(render_many, jobs)
+        print(f"📄 {len(rendered)} actas exportadas a {args.docx_dir}")
+
+    elapsed = time.monotonic() - started
+    stats["meetings_per_hour"] = round(stats["ok"] / elapsed * 3600, 1) if elapsed and stats["ok"] else 0.0
+    stats["elapsed_seconds"] = round(elapsed, 1)
+    return stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Genera actas de reunión en lote a partir de un directorio de transcripciones.")
+    parser.add_argument("directory", help="Directorio con las transcripciones")
+    parser.add_argument("--pattern", default="*.txt", help="Patrón de archivos a procesar (por defecto *.txt)")
+    parser.add_argument("--output", default="actas.jsonl", help="Archivo JSONL de resultados; se reanuda si ya existe")
+    parser.add_argument("--concurrency", type=int, default=4, help="Reuniones procesadas a la vez")
+    parser.add_argument("--requests-per-second", type=float, default=0.0,
+                        help="Límite global de llamadas al modelo por segundo (0 = sin límite)")
+    parser.add_argument("--docx-dir", help="Directorio donde exportar cada acta generada a .docx")
+    parser.add_argument("--mode", choices=["single", "parallel"], default="single", help="Modo de generación del acta")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    stats = asyncio.run(run_batch(args))
+    print(
+        f"\n📊 Completadas: {stats['ok']} | Errores: {stats['error']} | "
+        f"{stats['elapsed_seconds']}s | {stats['meetings_per_hour']} reuniones/hora"
+    )
+
+
+if __name__ == "__main__":
+    main()
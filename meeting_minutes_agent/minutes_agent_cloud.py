@@ -1,9 +1,14 @@
 from dotenv import load_dotenv
 from langgraph.graph import END, StateGraph, START
-from meeting_minutes_agent.state.types import State
+from langgraph.types import Send
+from meeting_minutes_agent.state.types import State, GraphConfig
 from meeting_minutes_agent.nodes.nodes import (
     keypoints_analysis_node,
+    ingest_segment_node,
     generation_node,
+    generate_section_node,
+    merge_sections_node,
+    MINUTES_SECTIONS,
     reflection_node,
     human_critique_node,
     revision_minutes_node,
@@ -13,15 +18,41 @@ from meeting_minutes_agent.nodes.nodes import (
 
 load_dotenv()
 
-def should_continue_keypoints_revision(state: State):
+def route_start(state: State):
+    # Transcript segments arriving while the meeting is running use the streaming entry,
+    # until the meeting ends and the full transcript is stored
+    if state.get("transcript_segments") and not state.get("transcript_id"):
+        return "ingest"
+    return "keypoints"
+
+def should_continue_ingest(state: State):
+    if state.get("meeting_ended", False):
+        return "human_keypoints"
+    return END
+
+def should_continue_keypoints_revision(state: State, config):
     if state.get("keypoints_approved", False):
+        if config.get("configurable", {}).get("generation_mode") == "parallel":
+            # Fan out one call per independent section of the minutes
+            return [
+                Send("generate_section", {
+                    "section": section,
+                    "transcript": state["transcript"],
+                    "keypoints": state["keypoints"],
+                    "meeting_facts": state.get("meeting_facts") or {}
+                })
+                for section in MINUTES_SECTIONS
+            ]
         return "generate"
     return "revise_keypoints"
 
 def should_continue_reflection(state: State):
-    if len(state["messages"]) > 2:
+    if state.get("reflection_count", 0) >= 1:
         # End after 1 iteration
         return "human_critique"
+    if not state.get("validation_issues"):
+        # The local checks passed, no need for an automatic critique
+        return "human_critique"
     return "reflect"
 
 def should_continue_revision(state: State):
@@ -29,21 +60,29 @@ def should_continue_revision(state: State):
         return END
     return "revision"
 
-builder = StateGraph(State)
+builder = StateGraph(State, config_schema=GraphConfig)
 builder.add_node("keypoints", keypoints_analysis_node)
+builder.add_node("ingest", ingest_segment_node)
 builder.add_node("human_keypoints", human_keypoints_node)
 builder.add_node("revise_keypoints", revise_keypoints_node)
 builder.add_node("generate", generation_node)
+builder.add_node("generate_section", generate_section_node)
+builder.add_node("merge_sections", merge_sections_node)
 builder.add_node("reflect", reflection_node)
 builder.add_node("human_critique", human_critique_node)
 builder.add_node("revision", revision_minutes_node)
 
-builder.add_edge(START, "keypoints")
+builder.add_conditional_edges(START, route_start)
 builder.add_edge("keypoints", "human_keypoints")
+builder.add_conditional_edges("ingest", should_continue_ingest)
 builder.add_conditional_edges("human_keypoints", should_continue_keypoints_revision)
 builder.add_edge("revise_keypoints", "human_keypoints")
 builder.add_conditional_edges("generate", should_continue_reflection)
+builder.add_edge("generate_section", "merge_sections")
+builder.add_conditional_edges("merge_sections", should_continue_reflection)
 builder.add_edge("reflect", "generate")
 builder.add_conditional_edges("human_critique", should_continue_revision)
+# The LangGraph server provides its own checkpointer; local entry points that need durable
+# human review compile the builder with checkpointing.open_checkpointer()
 graph = builder.compile()
 
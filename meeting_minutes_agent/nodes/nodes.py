@@ -1,8 +1,27 @@
 import json
-from langchain_core.messages import HumanMessage, AIMessage
+import asyncio
+import time
+from functools import lru_cache
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import HumanMessage, AIMessage, RemoveMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables.config import ensure_config, merge_configs
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.config import get_stream_writer
 from langchain_anthropic import ChatAnthropic
-from meeting_minutes_agent.state.types import State, MeetingMinutes, Keypoints
+from meeting_minutes_agent.state.types import (
+    State, SectionState, MeetingMinutes, MinutesPatch, Keypoints,
+    AttendeesSection, SummarySection, ActionItemsSection, AssignedActionsSection
+)
+from meeting_minutes_agent.utils.chunking import split_transcript, merge_keypoints
+from meeting_minutes_agent.utils.extraction import extract_meeting_facts, apply_meeting_facts
+from meeting_minutes_agent.utils.normalize import normalize_transcript
+from meeting_minutes_agent.utils.patch import apply_patch, check_minutes_shape
+from meeting_minutes_agent.utils.result_cache import cache_key, get_result_cache
+from meeting_minutes_agent.utils.store import ContentStore
+from meeting_minutes_agent.utils.tokens import estimate_tokens, estimate_messages, context_limit, check_call, TokenLimitError
+from meeting_minutes_agent.utils.usage import usage_record, cached_usage_record
+from meeting_minutes_agent.utils.validation import validate_minutes
 from dotenv import load_dotenv
 from langchain_openai.chat_models.base import BaseChatOpenAI
 import os
@@ -14,181 +33,682 @@ llm = ChatAnthropic(
 )
 """
 llm = BaseChatOpenAI(
-    model='deepseek-chat', 
+    model='deepseek-chat',
     openai_api_key=os.getenv('DEEPSEEK_API_KEY'),
     openai_api_base='https://api.deepseek.com',
-    max_tokens=8000
+    max_tokens=8000,
+    stream_usage=True
+)
+
+def _build_model(name: str, max_tokens: int):
+    if name.startswith("claude"):
+        return ChatAnthropic(model=name, max_tokens=max_tokens)
+    return BaseChatOpenAI(
+        model=name,
+        openai_api_key=os.getenv('DEEPSEEK_API_KEY'),
+        openai_api_base='https://api.deepseek.com',
+        max_tokens=max_tokens,
+        stream_usage=True
+    )
+
+# Small fast model for extraction and critique, e.g. MINUTES_FAST_MODEL=claude-3-5-haiku-20241022.
+# Without it every node uses the strong model above.
+fast_llm = _build_model(os.environ["MINUTES_FAST_MODEL"], 4000) if os.getenv("MINUTES_FAST_MODEL") else llm
+
+def _get_model(config, default, key):
+    model = config.get('configurable', {}).get(key, default)
+    if model == "fast":
+        return fast_llm
+    elif model == "strong":
+        return llm
+    else:
+        raise ValueError(f"Modelo desconocido para {key}: {model}")
+
+# Every call over the full transcript starts with this system prompt followed by the transcript,
+# so providers with prompt caching (DeepSeek automatically, Anthropic through cache_control)
+# can reuse the prefix. Node specific instructions always go after the transcript.
+MINUTES_SYSTEM_PROMPT = (
+    "You are an expert in analyzing meetings and creating meeting minutes. \n"
+    "The meeting transcript is given in the first message of the user. \n"
+    "Don't invent information that is not in the transcript. \n"
+    "Respond in Spanish."
 )
 
-async def keypoints_analysis_node(state: State) ->State:
-    analysis_prompt = ChatPromptTemplate.from_messages([
+def _dumps(artifact) -> str:
+    return json.dumps(artifact, ensure_ascii=False, indent=2)
+
+# Filler words, repeated phrases and split speaker turns are removed before the transcript is stored
+NORMALIZE_TRANSCRIPT = os.getenv("MINUTES_NORMALIZE_TRANSCRIPT", "1") != "0"
+
+def _prepare_transcript(text: str) -> tuple:
+    if not NORMALIZE_TRANSCRIPT:
+        return text, {}
+    normalized, stats = normalize_transcript(text)
+    return normalized, {"transcript_stats": stats}
+
+def _load_transcript(state: State) -> tuple:
+    """Return the transcript and, the first time, the update that moves it out of messages into its own channel."""
+    if state.get("transcript"):
+        return state["transcript"], {}
+    first = state["messages"][0]
+    transcript, stats = _prepare_transcript(first.content)
+    return transcript, {
+        **stats,
+        # The text as received stays available, normalization only feeds the prompts
+        "raw_transcript": first.content if transcript != first.content else None,
+        "transcript": transcript,
+        "transcript_id": ContentStore.key_for(transcript),
+        "messages": [RemoveMessage(id=first.id)]
+    }
+
+def _get_transcript(state: State) -> str:
+    return state["transcript"]
+
+def _meeting_facts(state: State) -> dict:
+    # Graphs started from a stored transcript may not have run the extraction yet
+    return state.get("meeting_facts") or extract_meeting_facts(_get_transcript(state))
+
+def _transcript_message(transcript: str, model) -> HumanMessage:
+    if isinstance(model, ChatAnthropic):
+        # Cache breakpoint right after the transcript: system prompt and transcript are reused
+        return HumanMessage(content=[
+            {"type": "text", "text": transcript, "cache_control": {"type": "ephemeral"}}
+        ])
+    return HumanMessage(content=transcript)
+
+def _with_artifact(messages: list, artifact) -> list:
+    # Show the latest artifact as the model's previous answer, right before the last feedback
+    return messages[:-1] + [AIMessage(content=_dumps(artifact)), messages[-1]]
+
+def _transcript_prompt(instructions: str) -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([
+        ("system", MINUTES_SYSTEM_PROMPT),
+        MessagesPlaceholder(variable_name="transcript"),
+        ("human", instructions),
+        MessagesPlaceholder(variable_name="messages", optional=True),
+    ])
+
+class _ToolArgsStream(AsyncCallbackHandler):
+    """
+    Follow the tool-call arguments a chat model streams and report the top-level fields as they complete.
+    Having tap_output_aiter/tap_output_iter makes it a streaming handler, so the model streams even
+    when the chain is invoked and the chain itself does not re-merge every chunk.
+    """
+
+    def __init__(self, on_fields):
+        self.on_fields = on_fields
+        self.args = ""
+        # Where the scan of the JSON arguments stands at the end of self.args
+        self.depth, self.in_string, self.escaped = 0, False, False
+
+    async def on_llm_new_token(self, token: str, *, chunk=None, **kwargs):
+        tool_chunks = getattr(getattr(chunk, "message", None), "tool_call_chunks", None)
+        piece = (tool_chunks[0].get("args") or "") if tool_chunks else ""
+        # Only a comma between top-level fields completes one, so parse just when the scan finds it
+        boundary = None
+        for offset, char in enumerate(piece):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+            elif char == "," and self.depth == 1:
+                boundary = len(self.args) + offset
+        self.args += piece
+        if boundary is not None:
+            try:
+                self.on_fields(json.loads(self.args[:boundary] + "}"))
+            except json.JSONDecodeError:
+                pass  # The final parse reports malformed arguments
+
+    def tap_output_aiter(self, run_id, output):
+        return output
+
+    def tap_output_iter(self, run_id, output):
+        return output
+
+async def _stream_structured(node: str, chain, inputs: dict) -> dict:
+    """
+    Run a structured call and send each field to the "custom" stream mode as soon as it is complete.
+    A field is complete once the model starts writing the next one; the rest are sent at the end.
+    """
+    writer = get_stream_writer()
+    emitted = set()
+
+    def emit(fields: dict):
+        for field, value in fields.items():
+            if field not in emitted:
+                emitted.add(field)
+                writer({"node": node, "field": field, "value": value})
+
+    config = merge_configs(ensure_config(), {"callbacks": [_ToolArgsStream(emit)]})
+    result = await chain.ainvoke(inputs, config)
+    emit(result.get("parsed") or {})
+    return result
+
+# Bump when a change outside the prompt text (schemas, post-processing) makes cached results stale
+PROMPT_VERSION = "1"
+
+def _model_name(model) -> str:
+    return getattr(model, "model_name", None) or getattr(model, "model", "")
+
+def _max_output_tokens(model) -> int:
+    return getattr(model, "max_tokens", None) or 4096
+
+@lru_cache(maxsize=None)
+def _schema_definition(schema) -> str:
+    # Field names, types and descriptions: editing any of them invalidates the cached results
+    return json.dumps(convert_to_openai_tool(schema), sort_keys=True)
+
+def _result_key(node: str, model, messages: list, schema) -> str:
+    # The rendered prompt covers the transcript, the approved key points and the feedback turns
+    messages = [(message.type, message.content) for message in messages]
+    return cache_key(PROMPT_VERSION, node, _model_name(model), _schema_definition(schema), messages)
+
+async def _invoke_structured(node: str, model, prompt: ChatPromptTemplate, schema, inputs: dict, stream_fields: bool = False, remaining_budget: int = None) -> tuple:
+    """Run a structured call and return the parsed result with its usage record."""
+    started = time.monotonic()
+    messages = prompt.format_messages(**inputs)
+    # SQLite blocks (opening the file included); keep it off the event loop the parallel sections share
+    result_cache = await asyncio.to_thread(get_result_cache)
+    key = _result_key(node, model, messages, schema) if result_cache else None
+    if key:
+        cached = await asyncio.to_thread(result_cache.get, key)
+        if cached is not None:
+            if stream_fields:
+                writer = get_stream_writer()
+                for field, value in cached.items():
+                    writer({"node": node, "field": field, "value": value})
+            return cached, cached_usage_record(node, _model_name(model), time.monotonic() - started)
+
+    # Fail before sending a request the provider would reject or that would overrun the run budget
+    check_call(node, _model_name(model), estimate_messages(messages), _max_output_tokens(model), remaining_budget)
+    chain = prompt | model.with_structured_output(schema, include_raw=True)
+    if stream_fields:
+        result = await _stream_structured(node, chain, inputs)
+    else:
+        result = await chain.ainvoke(inputs)
+    latency = time.monotonic() - started
+    # A plain-text reply can leave no "parsed" key in the chain output
+    if result.get("parsed") is None:
+        raise ValueError(f"Respuesta inválida del modelo en {node}: {result.get('parsing_error')}")
+    if key:
+        await asyncio.to_thread(result_cache.put, key, result["parsed"])
+    return result["parsed"], usage_record(node, result["raw"], latency)
+
+# Feedback turns kept verbatim in the history; older turns are folded into history_summary
+HISTORY_KEEP_MESSAGES = int(os.getenv("MINUTES_HISTORY_KEEP_MESSAGES", "6"))
+# Turns left after folding: folding down to half the window spaces the summary calls a few turns apart
+HISTORY_FOLD_TO = max(HISTORY_KEEP_MESSAGES // 2, 1)
+
+async def _compact_history(state: State, config) -> tuple:
+    """
+    Return the messages to send to the model, the state update that compacts the history and its usage.
+    Once the history grows past HISTORY_KEEP_MESSAGES, all but the last HISTORY_FOLD_TO turns are
+    folded into the running summary and removed, so the extra summary call only happens every few turns.
+    """
+    messages = state["messages"]
+    summary = state.get("history_summary", "")
+    update, usage = {}, []
+
+    if len(messages) > HISTORY_KEEP_MESSAGES:
+        old, messages = messages[:-HISTORY_FOLD_TO], messages[-HISTORY_FOLD_TO:]
+        model = _get_model(config, "fast", "critique_model")
+        summary_prompt = ChatPromptTemplate.from_messages([
+            (
+                "system",
+                "You keep a running summary of the feedback given while reviewing meeting minutes. \n"
+                "Update the summary with the new turns: keep every requested change, decision and correction "
+                "that still applies, and drop what was later reverted. Be brief. \n"
+                "Respond in Spanish."
+            ),
+            ("human", "Current summary:\n{summary}\n\nNew turns:\n{turns}"),
+        ])
+        turns = "\n".join(f"{message.type}: {message.content}" for message in old)
+        started = time.monotonic()
+        res = await (summary_prompt | model).ainvoke({"summary": summary or "(empty)", "turns": turns})
+        usage.append(usage_record("compact_history", res, time.monotonic() - started))
+        summary = res.content
+        update = {
+            "history_summary": summary,
+            "messages": [RemoveMessage(id=message.id) for message in old]
+        }
+
+    if summary:
+        messages = [HumanMessage(content=f"Summary of the earlier feedback in this session:\n{summary}")] + messages
+    return messages, update, usage
+
+# Token budget for a whole run (0 = no budget); configurable["token_budget"] overrides it
+TOKEN_BUDGET = int(os.getenv("MINUTES_TOKEN_BUDGET", "0"))
+# Rough size of the instructions, key points and facts sent along with the transcript, and of each answer
+PROMPT_OVERHEAD_TOKENS = 2000
+ANSWER_TOKENS = 2500
+# Calls that carry the full transcript in a run: keypoints, generation, reflection and regeneration
+TRANSCRIPT_CALLS_PER_RUN = 4
+
+def _token_budget(config) -> int:
+    return config.get("configurable", {}).get("token_budget", TOKEN_BUDGET) or 0
+
+def _remaining_budget(state: State, config):
+    budget = _token_budget(config)
+    if not budget:
+        return None
+    spent = sum(record.get("input_tokens", 0) + record.get("output_tokens", 0) for record in state.get("llm_usage", []))
+    return budget - spent
+
+def _token_preflight(transcript: str, config) -> dict:
+    """
+    Estimate the tokens of the run before the first paid call and reject it right away
+    if the minutes model cannot take the full transcript or the run would exceed the budget.
+    """
+    transcript_tokens = estimate_tokens(transcript)
+    minutes_model = _get_model(config, "strong", "minutes_model")
+    check_call(
+        "generate", _model_name(minutes_model),
+        transcript_tokens + PROMPT_OVERHEAD_TOKENS, _max_output_tokens(minutes_model)
+    )
+    run_tokens = TRANSCRIPT_CALLS_PER_RUN * (transcript_tokens + PROMPT_OVERHEAD_TOKENS + ANSWER_TOKENS)
+    budget = _token_budget(config)
+    if budget and run_tokens > budget:
+        raise TokenLimitError(f"La ejecución necesitaría unos {run_tokens} tokens y el presupuesto es de {budget}")
+    return {"transcript_tokens": transcript_tokens, "run_tokens": run_tokens, "budget": budget or None}
+
+# Transcripts longer than this are processed in chunks (map-reduce)
+KEYPOINTS_CHUNK_CHARS = int(os.getenv("MINUTES_CHUNK_CHARS", "24000"))
+# Maximum number of chunk extractions running at the same time
+KEYPOINTS_MAX_CONCURRENCY = int(os.getenv("MINUTES_MAX_CONCURRENCY", "4"))
+
+async def _extract_chunk_keypoints(model, chunk: str, index: int, total: int, semaphore: asyncio.Semaphore) -> tuple:
+    chunk_prompt = ChatPromptTemplate.from_messages([
         (
             "system",
-            "Your task is to review the provided meeting notes and extract key takeaways. \n"
+            "Your task is to review a fragment of a longer meeting transcript and extract its key takeaways. \n"
+            "The fragment is part {index} of {total}; only extract what is said in this fragment. \n"
             "Don't invent information that is not in the transcript. \n"
             "Respond in Spanish."
         ),
-        MessagesPlaceholder(variable_name="messages"),
+        ("human", "{chunk}"),
     ])
 
-    messages_dict = {"messages": state["messages"]}
-    
-    keypoints = analysis_prompt | llm.with_structured_output(Keypoints)
-    result = await keypoints.ainvoke(messages_dict)
-    result_str = json.dumps(result, ensure_ascii=False, indent=2)
-    
-    return {"messages": [AIMessage(content=result_str)]}
+    async with semaphore:
+        result, usage = await _invoke_structured(
+            "keypoints_chunk", model, chunk_prompt, Keypoints, {"chunk": chunk, "index": index, "total": total}
+        )
+    return result.get("key_points", []), usage
 
-async def human_keypoints_node(state: State) -> State:
-    return state
-
-async def revise_keypoints_node(state: State) -> State:
-    last_message = state["messages"][-1].content
-    keypoints_approved = last_message.strip().lower() == "aprobado" or not last_message.strip()
-    
-    if keypoints_approved:
-        return {
-            "messages": state["messages"],
-            "keypoints_approved": True
-        }
-        
-    # Find the last AI message with keypoints
-    last_keypoints = None
-    for message in reversed(state["messages"]):
-        if isinstance(message, AIMessage):
-            try:
-                last_keypoints = json.loads(message.content)
-                break
-            except json.JSONDecodeError:
-                continue
-    
-    if not last_keypoints:
-        raise ValueError("No se encontraron key points en el historial de mensajes")
-        
-    revision_prompt = ChatPromptTemplate.from_messages([
+async def _reduce_keypoints(model, keypoints: list) -> tuple:
+    reduce_prompt = ChatPromptTemplate.from_messages([
         (
             "system",
-            "Review the key points considering the user's comments. \n"
-            "Adjusts key points to accurately reflect feedback received. \n"
-            "Do not add information that is not in the original transcript unless the user indicates it. \n"
+            "You will receive key points extracted from consecutive fragments of the same meeting. \n"
+            "Merge them into a single list: combine duplicates and near-duplicates, keep every distinct decision, "
+            "agreement and task, and keep the chronological order of the meeting. \n"
+            "Don't invent information that is not in the key points. \n"
             "Respond in Spanish."
         ),
-        MessagesPlaceholder(variable_name="messages"),
+        ("human", "{key_points}"),
     ])
 
-    revise = revision_prompt | llm.with_structured_output(Keypoints)
-    result = await revise.ainvoke({"messages": state["messages"]})
-    result_str = json.dumps(result, ensure_ascii=False, indent=2)
-    
-    return {
-        "messages": [AIMessage(content=result_str)],
-        "keypoints_approved": False
-    }
+    return await _invoke_structured("keypoints_reduce", model, reduce_prompt, Keypoints, {"key_points": _dumps(keypoints)})
 
-async def generation_node(state: State) -> State:
-    # Find the last AI message with keypoints
-    last_keypoints = None
-    for message in reversed(state["messages"]):
-        if isinstance(message, AIMessage):
-            try:
-                last_keypoints = json.loads(message.content)
-                break
-            except json.JSONDecodeError:
-                continue
-    
-    if not last_keypoints:
-        raise ValueError("No se encontraron key points en el historial de mensajes")
-    
-    meeting_minutes_prompt = ChatPromptTemplate.from_messages([
+async def chunked_keypoints(transcript: str, model) -> tuple:
+    chunks = split_transcript(transcript, KEYPOINTS_CHUNK_CHARS)
+    semaphore = asyncio.Semaphore(KEYPOINTS_MAX_CONCURRENCY)
+    partials = await asyncio.gather(*(
+        _extract_chunk_keypoints(model, chunk, index, len(chunks), semaphore)
+        for index, chunk in enumerate(chunks, start=1)
+    ))
+    usage = [record for _, record in partials]
+    # Exact duplicates are dropped locally; the reduce call handles the rest
+    merged = merge_keypoints(points for points, _ in partials)
+    if len(chunks) <= 1:
+        return {"key_points": merged}, usage
+    result, reduce_usage = await _reduce_keypoints(model, merged)
+    return result, usage + [reduce_usage]
+
+async def keypoints_analysis_node(state: State, config) ->State:
+    model = _get_model(config, "fast", "keypoints_model")
+    transcript, update = _load_transcript(state)
+    update["token_estimate"] = _token_preflight(transcript, config)
+    update["meeting_facts"] = extract_meeting_facts(transcript)
+    # Chunk when the transcript is long, or when it would not fit the keypoints model in a single call
+    fits = (
+        update["token_estimate"]["transcript_tokens"] + PROMPT_OVERHEAD_TOKENS + _max_output_tokens(model)
+        <= context_limit(_model_name(model))
+    )
+    if len(transcript) > KEYPOINTS_CHUNK_CHARS or not fits:
+        result, usage = await chunked_keypoints(transcript, model)
+        return {**update, "keypoints": result, "minutes": None, "llm_usage": usage}
+
+    analysis_prompt = _transcript_prompt(
+        "Your task is to review the meeting transcript and extract key takeaways. \n"
+        "Respond in Spanish."
+    )
+
+    messages_dict = {"transcript": [_transcript_message(transcript, model)]}
+
+    result, usage = await _invoke_structured(
+        "keypoints", model, analysis_prompt, Keypoints, messages_dict, remaining_budget=_remaining_budget(state, config)
+    )
+
+    return {**update, "keypoints": result, "minutes": None, "llm_usage": [usage]}
+
+# Minimum amount of new transcript (in characters) before the running key points are updated
+STREAM_WINDOW_CHARS = int(os.getenv("MINUTES_STREAM_WINDOW_CHARS", "6000"))
+
+async def _extract_window_keypoints(model, window: str, known_keypoints: list, semaphore: asyncio.Semaphore) -> tuple:
+    window_prompt = ChatPromptTemplate.from_messages([
         (
             "system",
-            "As an expert in creating meeting minutes, first analize the approved key points and then generate the meeting minutes based on the transcript of the meeting provided by the user.\n"
-            "Action items must be fully aligned with key points.\n"  
-            "The assigned_actions must be fully aligned with the key points.\n"
-            "Do not add information that is not in the transcript. If user gives you a key point that is not in the transcript, only inlcude it in the key_points section.\n"
+            "You are following a meeting that is still in progress. \n"
+            "These key points have already been captured:\n"
+            "{key_points}\n"
+            "Review the latest fragment of the transcript and extract only the new key takeaways. "
+            "Do not repeat or rewrite the captured key points; they are kept as they are. "
+            "If the fragment changes something already captured, write the change itself as a new key point. \n"
+            "Don't invent information that is not in the transcript. \n"
             "Respond in Spanish."
         ),
-        ("human",
-          "Create a meeting minutes based on the key points and the transcript. \n"
-          "The key points are:\n"
-          "{key_points}\n"
-          "The transcript is:\n"
-          "{transcript}\n"
-          "Respond in Spanish."
-        ),
-        MessagesPlaceholder(variable_name="messages"),
+        ("human", "{window}"),
     ])
 
+    async with semaphore:
+        result, usage = await _invoke_structured(
+            "ingest", model, window_prompt, Keypoints, {"window": window, "key_points": _dumps(known_keypoints)}
+        )
+    return result.get("key_points", []), usage
+
+async def ingest_segment_node(state: State, config) -> State:
+    segments = state.get("transcript_segments", [])
+    processed = state.get("processed_segments", 0)
+    running_keypoints = (state.get("keypoints") or {}).get("key_points", [])
+    meeting_ended = state.get("meeting_ended", False)
+    window = "\n".join(segments[processed:])
+    if NORMALIZE_TRANSCRIPT:
+        window = normalize_transcript(window)[0]
+    usage = []
+
+    # Wait for a full window unless the meeting is over
+    if window.strip() and (len(window) >= STREAM_WINDOW_CHARS or meeting_ended):
+        model = _get_model(config, "fast", "keypoints_model")
+        semaphore = asyncio.Semaphore(KEYPOINTS_MAX_CONCURRENCY)
+        partials = await asyncio.gather(*(
+            _extract_window_keypoints(model, chunk, running_keypoints, semaphore)
+            for chunk in split_transcript(window, KEYPOINTS_CHUNK_CHARS)
+        ))
+        running_keypoints = merge_keypoints([running_keypoints, *(points for points, _ in partials)])
+        usage = [record for _, record in partials]
+        processed = len(segments)
+
+    update = {
+        "processed_segments": processed,
+        "keypoints": {"key_points": running_keypoints},
+        "llm_usage": usage
+    }
+    if meeting_ended:
+        transcript, stats = _prepare_transcript("\n".join(segments))
+        update.update(stats)
+        update["token_estimate"] = _token_preflight(transcript, config)
+        update["transcript"] = transcript
+        update["transcript_id"] = ContentStore.key_for(transcript)
+        update["meeting_facts"] = extract_meeting_facts(transcript)
+    return update
+
+async def human_keypoints_node(state: State) -> State:
+    return {}
+
+async def revise_keypoints_node(state: State, config) -> State:
+    last_message = state["messages"][-1].content
+    keypoints_approved = last_message.strip().lower() == "aprobado" or not last_message.strip()
+
+    if keypoints_approved:
+        return {"keypoints_approved": True}
+
+    last_keypoints = state.get("keypoints")
+    if not last_keypoints:
+        raise ValueError("No se encontraron key points en el estado")
+
+    model = _get_model(config, "fast", "keypoints_model")
+    revision_prompt = _transcript_prompt(
+        "Review the key points considering the user's comments. \n"
+        "Adjusts key points to accurately reflect feedback received. \n"
+        "Do not add information that is not in the original transcript unless the user indicates it. \n"
+        "Respond in Spanish."
+    )
+
+    messages, compaction, compaction_usage = await _compact_history(state, config)
     messages_dict = {
-        "messages": state["messages"],
-        "key_points": json.dumps(last_keypoints, ensure_ascii=False, indent=2),
-        "transcript": state["messages"][0].content
+        "transcript": [_transcript_message(_get_transcript(state), model)],
+        "messages": _with_artifact(messages, last_keypoints)
     }
-    
-    generate = meeting_minutes_prompt | llm.with_structured_output(MeetingMinutes)
-    result = await generate.ainvoke(messages_dict)
-    result_str = json.dumps(result, ensure_ascii=False, indent=2)
-    
+    result, usage = await _invoke_structured(
+        "revise_keypoints", model, revision_prompt, Keypoints, messages_dict, remaining_budget=_remaining_budget(state, config)
+    )
+
     return {
-        "messages": [AIMessage(content=result_str)],
-        "keypoints_approved": True
+        **compaction,
+        "keypoints": result,
+        "minutes": None,
+        "keypoints_approved": False,
+        "llm_usage": compaction_usage + [usage]
     }
 
-async def reflection_node(state: State) -> State:
-    reflection_prompt = ChatPromptTemplate.from_messages([
-        (
-            "system",
-            "You are an expert meeting minutes creator. Generate critique and recommendations for the meeting minutes provided.\n"
-            "Respond only with the critique and recommendations, no other text.\n"
-            "All key points must be included in the meeting minutes.\n"
-            "If the meeting minutes provided is already perfect, just say so.\n"
-            "You must respect the structure of the meeting minutes provided. Do not add or remove any sections.\n"
-            "The meeting transcript provided is given in the first message of the user.\n"
-            "Respond in Spanish language",
-        ),
-        MessagesPlaceholder(variable_name="messages"),
-    ])
-    reflect = reflection_prompt | llm
-    
-    cls_map = {"ai": HumanMessage, "human": AIMessage}
-    translated = [state["messages"][0]] + [
-        cls_map[msg.type](content=msg.content) for msg in state["messages"][1:]
-    ]
-    
-    res = await reflect.ainvoke(translated)
-    return {"messages": [HumanMessage(content=res.content)]}
+async def generation_node(state: State, config) -> State:
+    last_keypoints = state.get("keypoints")
+    if not last_keypoints:
+        raise ValueError("No se encontraron key points en el estado")
+
+    model = _get_model(config, "strong", "minutes_model")
+    meeting_minutes_prompt = _transcript_prompt(
+        "As an expert in creating meeting minutes, first analize the approved key points and then generate the meeting minutes based on the transcript of the meeting.\n"
+        "Action items must be fully aligned with key points.\n"
+        "The assigned_actions must be fully aligned with the key points.\n"
+        "Do not add information that is not in the transcript. If user gives you a key point that is not in the transcript, only inlcude it in the key_points section.\n"
+        "The key points are:\n"
+        "{key_points}\n"
+        "Speakers, names, emails and dates found automatically in the transcript:\n"
+        "{meeting_facts}\n"
+        "Use these values as they are for the date and the attendees' names and emails, and only fill in what is missing. "
+        "Speaker labels (e.g. Speaker A) are not names; use a name only when the transcript links it to a participant.\n"
+        "Respond in Spanish."
+    )
+
+    meeting_facts = _meeting_facts(state)
+
+    messages, compaction, compaction_usage = await _compact_history(state, config)
+    # A draft is only kept while it goes through the reflection loop
+    if state.get("minutes"):
+        messages = _with_artifact(messages, state["minutes"])
+
+    messages_dict = {
+        "transcript": [_transcript_message(_get_transcript(state), model)],
+        "messages": messages,
+        "key_points": _dumps(last_keypoints),
+        "meeting_facts": _dumps(meeting_facts)
+    }
+
+    result, usage = await _invoke_structured(
+        "generate", model, meeting_minutes_prompt, MeetingMinutes, messages_dict, stream_fields=True,
+        remaining_budget=_remaining_budget(state, config)
+    )
+    result = apply_meeting_facts(result, meeting_facts)
+
+    return {
+        **compaction,
+        "minutes": result,
+        "keypoints_approved": True,
+        "validation_issues": validate_minutes(result, last_keypoints.get("key_points", [])),
+        "llm_usage": compaction_usage + [usage]
+    }
+
+# Independent groups of MeetingMinutes fields generated concurrently in parallel mode
+MINUTES_SECTIONS = {
+    "attendees": (
+        AttendeesSection,
+        "Extract the meeting title, the date and time of the meeting and the attendees with their position, role and email.\n"
+        "Leave a field empty if it is not mentioned in the transcript.\n"
+        "Speakers, names, emails and dates found automatically in the transcript:\n"
+        "{meeting_facts}\n"
+        "Use these values as they are for the date and the attendees' names and emails, and only fill in what is missing. "
+        "Speaker labels (e.g. Speaker A) are not names; use a name only when the transcript links it to a participant."
+    ),
+    "summary": (
+        SummarySection,
+        "Write the executive summary of the meeting and the final list of key points, based on the approved key points."
+    ),
+    "action_items": (
+        ActionItemsSection,
+        "List the follow-up actions and agreed-upon decisions, and the next steps for the subsequent meeting.\n"
+        "Action items must be fully aligned with key points."
+    ),
+    "assigned_actions": (
+        AssignedActionsSection,
+        "List the action items with their owner, due date and a detailed description.\n"
+        "The assigned_actions must be fully aligned with the key points."
+    ),
+}
+
+async def generate_section_node(state: SectionState, config) -> State:
+    model = _get_model(config, "strong", "minutes_model")
+    section = state["section"]
+    schema, instructions = MINUTES_SECTIONS[section]
+
+    section_prompt = _transcript_prompt(
+        "You are creating one section of the meeting minutes.\n"
+        f"{instructions}\n"
+        "Do not add information that is not in the transcript.\n"
+        "The approved key points are:\n"
+        "{key_points}\n"
+        "Respond in Spanish."
+    )
+
+    messages_dict = {
+        "transcript": [_transcript_message(_get_transcript(state), model)],
+        "key_points": _dumps(state["keypoints"]),
+        "meeting_facts": _dumps(_meeting_facts(state))
+    }
+    result, usage = await _invoke_structured(
+        f"generate_{section}", model, section_prompt, schema, messages_dict, stream_fields=True
+    )
+
+    return {"minutes_sections": {section: result}, "llm_usage": [usage]}
+
+async def merge_sections_node(state: State) -> State:
+    minutes = {}
+    for section in MINUTES_SECTIONS:
+        minutes.update(state["minutes_sections"][section])
+    minutes["feedback_response"] = ""
+    minutes = {field: minutes.get(field) for field in MeetingMinutes.__annotations__}
+    minutes = apply_meeting_facts(minutes, _meeting_facts(state))
+
+    return {
+        "minutes": minutes,
+        "keypoints_approved": True,
+        "validation_issues": validate_minutes(minutes, (state.get("keypoints") or {}).get("key_points", []))
+    }
+
+async def reflection_node(state: State, config) -> State:
+    model = _get_model(config, "fast", "critique_model")
+    reflection_prompt = _transcript_prompt(
+        "You are an expert meeting minutes creator. Automatic checks found problems in the meeting minutes provided.\n"
+        "Generate critique and recommendations that fix those problems, using the transcript for context.\n"
+        "Respond only with the critique and recommendations, no other text.\n"
+        "All key points must be included in the meeting minutes.\n"
+        "You must respect the structure of the meeting minutes provided. Do not add or remove any sections.\n"
+        "Respond in Spanish language"
+    )
+    reflect = reflection_prompt | model
+
+    # Only the draft and the failed checks are sent, not the whole conversation
+    draft = (
+        _dumps(state["minutes"])
+        + "\n\nAutomatic checks found these problems:\n"
+        + "\n".join(state.get("validation_issues") or [])
+    )
+    started = time.monotonic()
+    res = await reflect.ainvoke({
+        "transcript": [_transcript_message(_get_transcript(state), model)],
+        "messages": [HumanMessage(content=draft)]
+    })
+    latency = time.monotonic() - started
+    return {
+        "messages": [HumanMessage(content=res.content)],
+        "reflection_count": state.get("reflection_count", 0) + 1,
+        "llm_usage": [usage_record("reflect", res, latency)]
+    }
 
 async def human_critique_node(state: State) -> State:
-    return state
+    return {}
 
-async def revision_minutes_node(state: State) -> State:
+async def revision_minutes_node(state: State, config) -> State:
     last_message = state["messages"][-1].content
     minutes_approved = last_message.strip().lower() == "aprobado" or not last_message.strip()
-    
+
     if minutes_approved:
         return {
-            "messages": state["messages"],
             "keypoints_approved": True,
             "minutes_approved": True
         }
-        
-    revision_prompt = ChatPromptTemplate.from_messages([
-        (
-            "system", 
+
+    model = _get_model(config, "strong", "minutes_model")
+    patch_prompt = _transcript_prompt(
+        "Revises the previous minutes considering the criticisms and comments received.\n "
+        "Do not rewrite the minutes: respond only with the minimal list of operations that apply the requested changes, "
+        "using JSON Pointer paths over the fields of the previous minutes and JSON encoded values. \n"
+        "If you are asked to add information that is not included in the minutes, first review the meeting transcript for context. If not, include what the user is asking for without adding any context. \n"
+        "Respond in Spanish language"
+    )
+
+    messages, compaction, usage = await _compact_history(state, config)
+    messages_dict = {
+        "transcript": [_transcript_message(_get_transcript(state), model)],
+        "messages": _with_artifact(messages, state["minutes"])
+    }
+    try:
+        patch, patch_usage = await _invoke_structured(
+            "revision_patch", model, patch_prompt, MinutesPatch, messages_dict, remaining_budget=_remaining_budget(state, config)
+        )
+        usage.append(patch_usage)
+        result = apply_patch(state["minutes"], patch.get("operations"))
+        result["feedback_response"] = patch.get("feedback_response") or ""
+        check_minutes_shape(result, MeetingMinutes)
+    except TokenLimitError:
+        raise
+    except ValueError:
+        # Invalid patch: fall back to regenerating the whole minutes
+        result = None
+
+    if result is None:
+        revision_prompt = _transcript_prompt(
             "Revises the previous minutes considering the criticisms and comments received.\n "
             "Makes adjustments to address comments accurately and professionally. \n"
             "If you are asked to add information that is not included in the minutes, first review the meeting transcript for context. If not, include what the user is asking for without adding any context. \n"
-            "Respond in Spanish language",
-        ),
-        MessagesPlaceholder(variable_name="messages"),
-    ])
+            "Respond in Spanish language"
+        )
+        result, revision_usage = await _invoke_structured(
+            "revision", model, revision_prompt, MeetingMinutes, messages_dict, stream_fields=True,
+            remaining_budget=_remaining_budget(state, config)
+        )
+        usage.append(revision_usage)
+    else:
+        # Send the changed sections the same way a full revision streams them
+        writer = get_stream_writer()
+        for field, value in result.items():
+            if value != state["minutes"].get(field):
+                writer({"node": "revision", "field": field, "value": value})
 
-    revise = revision_prompt | llm.with_structured_output(MeetingMinutes)
-    result = await revise.ainvoke({"messages": state["messages"]})
-    result_str = json.dumps(result, ensure_ascii=False, indent=2)
-    
     return {
-        "messages": [AIMessage(content=result_str)],
+        **compaction,
+        "minutes": result,
         "keypoints_approved": True,
-        "minutes_approved": False
-    }  
\ No newline at end of file
+        "minutes_approved": False,
+        "llm_usage": usage
+    }
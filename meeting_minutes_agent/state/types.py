@@ -1,11 +1,8 @@
-from typing import Annotated, List
+import operator
+from typing import Annotated, List, Literal
 from typing_extensions import TypedDict
 from langgraph.graph.message import add_messages
 
-class State(TypedDict):
-    messages: Annotated[list, add_messages]
-    keypoints_approved: Annotated[bool, ..., "Flag indicating if keypoints have been approved"] = False
-
 class Attendee(TypedDict):
     name: Annotated[str, ..., "Participant's full name"]
     position: Annotated[str, ..., "Professional title or role within the organization"]
@@ -28,5 +25,67 @@ class MeetingMinutes(TypedDict):
     assigned_actions: Annotated[List[Action], ..., "Detailed action items with ownership and deadlines"]
     feedback_response: Annotated[str, ..., "Response to the reviewer on the changes made"]
 
+class PatchOperation(TypedDict):
+    op: Annotated[Literal['add', 'replace', 'remove'], ..., "Kind of change"]
+    path: Annotated[str, ..., "JSON Pointer to the changed value, e.g. /assigned_actions/0/due_date or /key_points/-"]
+    value: Annotated[str, ..., "New value encoded as JSON (empty for remove)"]
+
+class MinutesPatch(TypedDict):
+    operations: Annotated[List[PatchOperation], ..., "Minimal list of changes to apply to the minutes"]
+    feedback_response: Annotated[str, ..., "Response to the reviewer on the changes made"]
+
 class Keypoints(TypedDict):
-    key_points: Annotated[List[str], ..., "Strategic points and major discussion outcomes"]
\ No newline at end of file
+    key_points: Annotated[List[str], ..., "Strategic points and major discussion outcomes"]
+
+class AttendeesSection(TypedDict):
+    title: Annotated[str, ..., "Official meeting title or agenda topic"]
+    date: Annotated[str, ..., "Meeting date and time"]
+    attendees: Annotated[List[Attendee], ..., "List of participants with their roles, positions, and contact emails"]
+
+class SummarySection(TypedDict):
+    summary: Annotated[str, ..., "Executive summary highlighting key discussions and decisions"]
+    key_points: Annotated[List[str], ..., "Strategic points and major discussion outcomes"]
+
+class ActionItemsSection(TypedDict):
+    action_items: Annotated[List[str], ..., "Follow-up actions and agreed-upon decisions"]
+    follow_up: Annotated[List[str], ..., "Next steps and agenda items for subsequent meeting"]
+
+class AssignedActionsSection(TypedDict):
+    assigned_actions: Annotated[List[Action], ..., "Detailed action items with ownership and deadlines"]
+
+def merge_sections(left: dict, right: dict) -> dict:
+    return {**(left or {}), **(right or {})}
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+    history_summary: Annotated[str, ..., "Running summary of the feedback turns removed from messages"]
+    transcript: Annotated[str, ..., "Normalized transcript, kept out of messages so nodes never replay it"]
+    transcript_id: Annotated[str, ..., "Content hash of the normalized transcript"]
+    raw_transcript: Annotated[str, ..., "Transcript as received when normalization changed it; streamed meetings keep it in transcript_segments"]
+    transcript_stats: Annotated[dict, ..., "Size of the transcript before and after normalization"]
+    keypoints: Annotated[Keypoints, ..., "Latest key points extracted or revised"]
+    meeting_facts: Annotated[dict, ..., "Speakers, names, emails and dates extracted locally from the transcript"]
+    minutes: Annotated[MeetingMinutes, ..., "Latest meeting minutes draft"]
+    minutes_sections: Annotated[dict, merge_sections]
+    validation_issues: Annotated[List[str], ..., "Problems found by the local checks on the latest draft"]
+    keypoints_approved: Annotated[bool, ..., "Flag indicating if keypoints have been approved"] = False
+    minutes_approved: Annotated[bool, ..., "Flag indicating if the minutes have been approved"]
+    reflection_count: Annotated[int, ..., "Number of automatic critiques of the minutes"]
+    llm_usage: Annotated[List[dict], operator.add]
+    token_estimate: Annotated[dict, ..., "Estimated transcript and run tokens checked before the first call"]
+    transcript_segments: Annotated[List[str], operator.add]
+    processed_segments: Annotated[int, ..., "Number of transcript segments already analyzed"]
+    meeting_ended: Annotated[bool, ..., "Flag indicating that no more transcript segments will arrive"]
+
+class SectionState(TypedDict):
+    section: str
+    transcript: str
+    keypoints: Keypoints
+    meeting_facts: dict
+
+class GraphConfig(TypedDict):
+    generation_mode: Literal['single', 'parallel']
+    keypoints_model: Literal['fast', 'strong']
+    critique_model: Literal['fast', 'strong']
+    minutes_model: Literal['fast', 'strong']
+    token_budget: int
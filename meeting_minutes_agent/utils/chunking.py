@@ -0,0 +1,82 @@
+import re
+import unicodedata
+from typing import Iterable, List
+
+# Etiqueta de hablante al inicio de línea, p. ej. "Speaker A:" o "Gloria:"
+SPEAKER_TURN = re.compile(r"^[ \t]*[^\W\d][\w .'-]{0,40}:[ \t]", re.MULTILINE)
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def _split_long(unit: str, max_chars: int) -> List[str]:
+    """Corta una unidad más larga que el presupuesto, primero por frases y luego por palabras."""
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_END.split(unit):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_transcript(text: str, max_chars: int) -> List[str]:
+    """
+    Divide una transcripción en fragmentos de hasta max_chars caracteres.
+    Se respetan los turnos de hablante cuando existen; si no, se corta por frases.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    starts = [match.start() for match in SPEAKER_TURN.finditer(text)]
+    if len(starts) > 1:
+        bounds = sorted({0, *starts, len(text)})
+        units = [text[start:end].strip() for start, end in zip(bounds, bounds[1:])]
+        separator = "\n"
+    else:
+        units = SENTENCE_END.split(text)
+        separator = " "
+
+    chunks = []
+    current = ""
+    for unit in filter(None, units):
+        for piece in _split_long(unit, max_chars) if len(unit) > max_chars else [unit]:
+            if current and len(current) + len(piece) + len(separator) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}{separator}{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas, sin tildes ni signos de puntuación y con espacios simples."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+def merge_keypoints(keypoint_lists: Iterable[List[str]]) -> List[str]:
+    """Une listas de puntos clave conservando el orden y eliminando duplicados exactos."""
+    seen = set()
+    merged = []
+    for keypoints in keypoint_lists:
+        for keypoint in keypoints:
+            key = normalize_text(keypoint)
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(keypoint.strip())
+    return merged
@@ -0,0 +1,80 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+from docx import Document
+
+# Plantilla .docx opcional (estilos, encabezado, logo); sin ella se usa el documento por defecto de python-docx
+DOCX_TEMPLATE = os.getenv("MINUTES_DOCX_TEMPLATE")
+
+# Plantillas ya leídas en este proceso, por ruta y fecha de modificación
+_templates = {}
+
+
+def _load_template(template: Optional[str]):
+    key = (template, os.path.getmtime(template) if template else None)
+    if key not in _templates:
+        _templates.clear()
+        _templates[key] = Document(template) if template else Document()
+    return _templates[key]
+
+
+def _add_list(document, title: str, items: List[str]):
+    document.add_heading(title, level=2)
+    for item in items or []:
+        document.add_paragraph(item, style="List Bullet")
+
+
+def render_minutes(minutes: dict, path: str, template: Optional[str] = DOCX_TEMPLATE) -> str:
+    """Escribe el acta en un .docx partiendo de una copia de la plantilla en caché y devuelve la ruta."""
+    document = copy.deepcopy(_load_template(template))
+
+    document.add_heading(minutes.get("title") or "Acta de reunión", level=1)
+    if minutes.get("date"):
+        document.add_paragraph(f"Fecha: {minutes['date']}")
+
+    document.add_heading("Asistentes", level=2)
+    for attendee in minutes.get("attendees") or []:
+        details = ", ".join(filter(None, [attendee.get("position"), attendee.get("role"), attendee.get("email")]))
+        document.add_paragraph(f"{attendee.get('name', '')} ({details})" if details else attendee.get("name", ""), style="List Bullet")
+
+    document.add_heading("Resumen", level=2)
+    document.add_paragraph(minutes.get("summary") or "")
+
+    _add_list(document, "Puntos clave", minutes.get("key_points"))
+    _add_list(document, "Acciones acordadas", minutes.get("action_items"))
+    _add_list(document, "Seguimiento", minutes.get("follow_up"))
+
+    assigned = minutes.get("assigned_actions") or []
+    if assigned:
+        document.add_heading("Acciones asignadas", level=2)
+        table = document.add_table(rows=1, cols=3)
+        table.style = "Table Grid"
+        for cell, header in zip(table.rows[0].cells, ("Responsable", "Fecha límite", "Descripción")):
+            cell.text = header
+        for action in assigned:
+            cells = table.add_row().cells
+            cells[0].text = action.get("owner") or ""
+            cells[1].text = action.get("due_date") or ""
+            cells[2].text = action.get("description") or ""
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document.save(path)
+    return path
+
+
+def _render_job(job: Tuple[dict, str, Optional[str]]) -> str:
+    minutes, path, template = job
+    return render_minutes(minutes, path, template)
+
+
+def render_many(jobs: Iterable[Tuple[dict, str]], template: Optional[str] = DOCX_TEMPLATE, max_workers: Optional[int] = None) -> List[str]:
+    """
+    Renderiza muchas actas en paralelo con un pool de procesos.
+    Cada proceso lee la plantilla una sola vez y la reutiliza para todas las actas que le tocan.
+    """
+    jobs = [(minutes, path, template) for minutes, path in jobs]
+    if len(jobs) <= 1:
+        return [_render_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_load_template, initargs=(template,)) as executor:
+        return list(executor.map(_render_job, jobs, chunksize=max(1, len(jobs) // (4 * (max_workers or os.cpu_count() or 1)))))
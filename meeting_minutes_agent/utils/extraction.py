@@ -0,0 +1,91 @@
+import re
+from collections import Counter
+from typing import List
+from meeting_minutes_agent.utils.chunking import SPEAKER_TURN, normalize_text
+
+EMAIL = re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b")
+MONTHS = "enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|setiembre|octubre|noviembre|diciembre"
+DATE = re.compile(
+    r"\b(?:\d{4}-\d{1,2}-\d{1,2}"
+    r"|\d{1,2}[/-]\d{1,2}[/-]\d{2,4}"
+    rf"|\d{{1,2}} de (?:{MONTHS})(?: de(?:l)? \d{{4}})?)\b",
+    re.IGNORECASE
+)
+TIME = re.compile(r"\b(?:[01]?\d|2[0-3]):[0-5]\d(?:\s?(?:am|pm|a\.\s?m\.|p\.\s?m\.))?", re.IGNORECASE)
+CAPITALIZED = re.compile(r"\b[A-ZÁÉÍÓÚÑ][a-záéíóúñü]{2,}(?: [A-ZÁÉÍÓÚÑ][a-záéíóúñü]{2,})*\b")
+SENTENCE_START = re.compile(r"(?:^|[.!?¿¡:…\n])\s*$")
+
+# Palabras que suelen ir en mayúscula sin ser nombres de persona
+NOT_NAMES = {
+    "speaker", "texto", "intervenciones", "hablante", "entonces", "bueno", "gracias", "cierto", "formato",
+    "automatico", "correo", "usted", "ustedes", "senor", "senora", "don", "dona",
+    "lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo", *MONTHS.split("|"),
+}
+
+# Máximo de nombres candidatos que se pasan al modelo
+MAX_NAMES = 20
+
+
+def _speakers(text: str) -> List[dict]:
+    turns = Counter(match.group().strip().rstrip(":").strip() for match in SPEAKER_TURN.finditer(text))
+    return [{"label": label, "turns": count} for label, count in turns.most_common()]
+
+
+def _names(text: str) -> List[str]:
+    counts = Counter()
+    first_seen = {}
+    for match in CAPITALIZED.finditer(text):
+        name = match.group()
+        # Solo cuentan las mayúsculas dentro de la frase, p. ej. "le pasamos a Sebastián"
+        if SENTENCE_START.search(text[max(0, match.start() - 3):match.start()]):
+            continue
+        if normalize_text(name.split()[0]) in NOT_NAMES:
+            continue
+        counts[name] += 1
+        first_seen.setdefault(name, match.start())
+    return sorted(counts, key=lambda name: (-counts[name], first_seen[name]))[:MAX_NAMES]
+
+
+def _unique(values) -> List[str]:
+    return list(dict.fromkeys(value.strip() for value in values))
+
+
+def extract_meeting_facts(text: str) -> dict:
+    """
+    Índice compacto de los datos que se pueden leer sin el modelo: etiquetas de hablante,
+    nombres propios, correos, fechas y horas, en orden de aparición (los nombres, por frecuencia).
+    """
+    return {
+        "speakers": _speakers(text),
+        "names": _names(text),
+        "emails": _unique(EMAIL.findall(text)),
+        "dates": _unique(DATE.findall(text)),
+        "times": _unique(TIME.findall(text)),
+    }
+
+
+def apply_meeting_facts(minutes: dict, facts: dict) -> dict:
+    """Completa la fecha y los correos de los asistentes que el modelo dejó vacíos con los datos extraídos."""
+    minutes = dict(minutes)
+    if not (minutes.get("date") or "").strip() and facts.get("dates"):
+        minutes["date"] = facts["dates"][0]
+
+    emails = facts.get("emails") or []
+    # Correos ya presentes en el acta: nunca se asignan a otro asistente
+    used = {attendee["email"].strip().lower() for attendee in minutes.get("attendees") or [] if attendee.get("email")}
+    attendees = []
+    for attendee in minutes.get("attendees") or []:
+        if not attendee.get("email"):
+            name_tokens = [token for token in normalize_text(attendee.get("name", "")).split() if len(token) >= 3]
+            # Un correo se asigna solo si su parte local contiene todas las palabras del nombre
+            match = next((
+                email for email in emails
+                if name_tokens and email.lower() not in used
+                and all(token in normalize_text(email.split("@")[0]) for token in name_tokens)
+            ), None)
+            if match:
+                used.add(match.lower())
+            attendee = {**attendee, "email": match}
+        attendees.append(attendee)
+    minutes["attendees"] = attendees
+    return minutes
@@ -0,0 +1,122 @@
+import re
+from typing import List, Tuple
+from meeting_minutes_agent.utils.chunking import SPEAKER_TURN, normalize_text
+
+# Muletillas vocales sin contenido: "eh", "ehh", "em", "mmm", "mmh", "ah"; "mm" son milímetros
+FILLER = re.compile(r"(?<!\w)(?:e+h+|e+m+|m{3,}|m+h+|a+h+)(?!\w)[,.]?\s*", re.IGNORECASE)
+# Encabezado sin texto detrás, p. ej. "Texto transcrito:"; no es el turno de un hablante
+HEADING = re.compile(r"^[ \t]*[^\W\d][\w .'-]{0,40}:[ \t]*$")
+WORD = re.compile(r"\S+\s*")
+
+# Longitud máxima (en palabras) de las repeticiones que se colapsan, p. ej. "no sé, no sé, no sé si"
+MAX_NGRAM = 6
+
+
+def _collapsible(key: str) -> bool:
+    # Cifras y letras sueltas se repiten con sentido: "3 3 4 5 5 6", "100 100 pesos"
+    return len(key) > 1 and not any(char.isdigit() for char in key)
+
+
+def collapse_repeats(text: str, max_ngram: int = MAX_NGRAM) -> str:
+    """Quita las repeticiones consecutivas de una misma secuencia de hasta max_ngram palabras."""
+    tokens = WORD.findall(text)
+    keys = [normalize_text(token) for token in tokens]
+    for size in range(max_ngram, 0, -1):
+        kept_tokens, kept_keys = [], []
+        i = 0
+        while i < len(tokens):
+            window = keys[i:i + size]
+            # Un bloque que repite exactamente al anterior lo reemplaza, conservando la puntuación del último
+            if len(window) == size and all(map(_collapsible, window)) and kept_keys[-size:] == window:
+                kept_tokens[-size:] = tokens[i:i + size]
+                i += size
+                continue
+            kept_tokens.append(tokens[i])
+            kept_keys.append(keys[i])
+            i += 1
+        tokens, keys = kept_tokens, kept_keys
+    return "".join(tokens).strip()
+
+
+def clean_utterance(text: str) -> str:
+    text = FILLER.sub("", text)
+    return " ".join(collapse_repeats(text).split())
+
+
+def _split_turn(line: str) -> Tuple[str, str]:
+    match = SPEAKER_TURN.match(line)
+    if not match:
+        return "", line
+    return match.group().strip().rstrip(":").strip(), line[match.end():]
+
+
+class TranscriptNormalizer:
+    """
+    Normaliza una transcripción a medida que llegan sus líneas: quita muletillas y repeticiones
+    y une los turnos consecutivos del mismo hablante. El último turno queda abierto hasta que
+    habla otra persona o se llama a finish().
+    """
+
+    def __init__(self):
+        self.input_chars = 0
+        self.output_chars = 0
+        self._speaker = None
+        self._turn: List[str] = []
+        self._pending = ""
+
+    def _close_turn(self) -> List[str]:
+        if self._speaker is None:
+            return []
+        text = clean_utterance(" ".join(self._turn))
+        line = f"{self._speaker}: {text}" if self._speaker else text
+        self._speaker, self._turn = None, []
+        if not text:
+            return []
+        self.output_chars += len(line) + 1
+        return [line]
+
+    def _add_lines(self, lines: List[str]) -> List[str]:
+        done = []
+        for line in lines:
+            if not line.strip():
+                continue
+            if HEADING.match(line):
+                done += self._close_turn()
+                self.output_chars += len(line.strip()) + 1
+                done.append(line.strip())
+                continue
+            speaker, utterance = _split_turn(line)
+            # Las líneas sin etiqueta continúan el turno de texto libre, no el del último hablante
+            if speaker != self._speaker:
+                done += self._close_turn()
+                self._speaker = speaker
+            self._turn.append(utterance.strip())
+        return done
+
+    def feed(self, text: str) -> List[str]:
+        """Procesa un fragmento y devuelve las líneas normalizadas que ya están completas."""
+        self.input_chars += len(text)
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        return self._add_lines(lines)
+
+    def finish(self) -> List[str]:
+        """Cierra la transcripción y devuelve las líneas que quedaban pendientes."""
+        done = self._add_lines([self._pending])
+        self._pending = ""
+        return done + self._close_turn()
+
+    @property
+    def compression_ratio(self) -> float:
+        return round(self.output_chars / self.input_chars, 3) if self.input_chars else 1.0
+
+
+def normalize_transcript(text: str) -> Tuple[str, dict]:
+    """Normaliza una transcripción completa y devuelve el texto con sus estadísticas de compresión."""
+    normalizer = TranscriptNormalizer()
+    normalized = "\n".join(normalizer.feed(text) + normalizer.finish())
+    return normalized, {
+        "input_chars": normalizer.input_chars,
+        "output_chars": len(normalized),
+        "compression_ratio": round(len(normalized) / len(text), 3) if text else 1.0,
+    }
@@ -0,0 +1,84 @@
+import copy
+import json
+from typing import List
+
+
+def _parse_path(path: str) -> List[str]:
+    if not path.startswith("/"):
+        raise ValueError(f"Ruta de parche inválida: '{path}'")
+    return [part.replace("~1", "/").replace("~0", "~") for part in path[1:].split("/")]
+
+
+def _index(container: list, part: str, allow_end: bool) -> int:
+    if part == "-" and allow_end:
+        return len(container)
+    if not part.isdigit() or int(part) > len(container) - (0 if allow_end else 1):
+        raise ValueError(f"Índice fuera de rango en el parche: '{part}'")
+    return int(part)
+
+
+def apply_patch(document: dict, operations: List[dict]) -> dict:
+    """
+    Aplica operaciones add / replace / remove estilo JSON Patch sobre una copia del documento.
+    El valor de cada operación llega como texto JSON. Lanza ValueError si alguna operación no es válida.
+    """
+    if not isinstance(operations, list):
+        raise ValueError("El parche no contiene una lista de operaciones")
+    result = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or not isinstance(operation.get("path"), str):
+            raise ValueError(f"Operación de parche mal formada: {operation!r}")
+        if not isinstance(operation.get("value"), (str, type(None))):
+            raise ValueError(f"El valor del parche para '{operation['path']}' no es texto JSON")
+        op = operation.get("op")
+        parts = _parse_path(operation["path"])
+        if op not in ("add", "replace", "remove"):
+            raise ValueError(f"Operación de parche no soportada: '{op}'")
+        value = None
+        if op != "remove":
+            try:
+                value = json.loads(operation.get("value") or "null")
+            except json.JSONDecodeError as error:
+                raise ValueError(f"Valor inválido en el parche para '{operation.get('path')}': {error}")
+
+        parent = result
+        for part in parts[:-1]:
+            if isinstance(parent, list):
+                parent = parent[_index(parent, part, allow_end=False)]
+            elif isinstance(parent, dict) and part in parent:
+                parent = parent[part]
+            else:
+                raise ValueError(f"Ruta inexistente en el parche: '{operation.get('path')}'")
+
+        last = parts[-1]
+        if isinstance(parent, list):
+            index = _index(parent, last, allow_end=op == "add")
+            if op == "add":
+                parent.insert(index, value)
+            elif op == "replace":
+                parent[index] = value
+            else:
+                del parent[index]
+        elif isinstance(parent, dict):
+            if op != "add" and last not in parent:
+                raise ValueError(f"Ruta inexistente en el parche: '{operation.get('path')}'")
+            if op == "remove":
+                del parent[last]
+            else:
+                parent[last] = value
+        else:
+            raise ValueError(f"Ruta inexistente en el parche: '{operation.get('path')}'")
+    return result
+
+
+def check_minutes_shape(minutes: dict, schema) -> None:
+    """Comprueba que un acta parcheada conserve los campos del esquema y el tipo de cada uno."""
+    for field, annotation in schema.__annotations__.items():
+        if field not in minutes:
+            raise ValueError(f"El parche eliminó el campo '{field}'")
+        expected = getattr(annotation.__origin__, "__origin__", annotation.__origin__)
+        if expected in (list, str) and not isinstance(minutes[field], expected):
+            raise ValueError(f"El parche cambió el tipo del campo '{field}'")
+    extra = set(minutes) - set(schema.__annotations__)
+    if extra:
+        raise ValueError(f"El parche agregó campos desconocidos: {', '.join(sorted(extra))}")
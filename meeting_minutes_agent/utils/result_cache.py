@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Optional
+
+
+def cache_key(*parts) -> str:
+    """Clave sha256 de cualquier combinación de valores serializables en JSON."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Caché persistente de resultados del modelo en SQLite, con expiración por antigüedad (TTL)
+    y desalojo de las entradas usadas hace más tiempo cuando se supera max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        # Último acceso de las claves leídas desde la última escritura; se guarda en put()
+        self._accessed = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Solo lee: el acceso se anota en memoria y las entradas caducadas se borran en put()."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl_seconds and now - created > self.ttl_seconds:
+                return None
+            self._accessed[key] = now
+        return json.loads(value)
+
+    def put(self, key: str, value: dict):
+        now = time.time()
+        with self._lock:
+            # Los accesos pendientes cuentan para decidir qué entradas se desalojan
+            self._db.executemany(
+                "UPDATE results SET accessed = ? WHERE key = ?",
+                [(accessed, accessed_key) for accessed_key, accessed in self._accessed.items()]
+            )
+            self._accessed.clear()
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._db.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            if self.ttl_seconds:
+                self._db.execute("DELETE FROM results WHERE created < ?", (now - self.ttl_seconds,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+
+
+# MINUTES_RESULT_CACHE=0 desactiva la caché
+RESULT_CACHE_ENABLED = os.getenv("MINUTES_RESULT_CACHE", "1") != "0"
+RESULT_CACHE_PATH = os.getenv(
+    "MINUTES_RESULT_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "meeting_minutes", "results.sqlite3")
+)
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_opened = False
+_result_cache_lock = Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Devuelve la caché del proceso, que se abre en el primer uso y no al importar el módulo.
+    Si no se puede abrir (p. ej. un directorio de solo lectura) se trabaja sin caché.
+    """
+    global _result_cache, _result_cache_opened
+    with _result_cache_lock:
+        if not _result_cache_opened and RESULT_CACHE_ENABLED:
+            try:
+                _result_cache = ResultCache(
+                    RESULT_CACHE_PATH,
+                    max_entries=int(os.getenv("MINUTES_RESULT_CACHE_ENTRIES", "5000")),
+                    ttl_seconds=float(os.getenv("MINUTES_RESULT_CACHE_TTL", str(7 * 24 * 3600)))
+                )
+            except (OSError, sqlite3.Error) as e:
+                print(f"Caché de resultados desactivada: {e}")
+        _result_cache_opened = True
+    return _result_cache
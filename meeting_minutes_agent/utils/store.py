@@ -0,0 +1,81 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+
+
+class ContentStore:
+    """
+    Almacén de textos direccionado por contenido.
+    Cada texto se guarda una sola vez en disco bajo su hash sha256 y los más usados
+    se mantienen en memoria.
+    """
+
+    def __init__(self, directory: str, max_memory_items: int = 32):
+        self.directory = directory
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def _remember(self, key: str, text: str):
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def put(self, text: str) -> str:
+        """Guarda el texto (si no existe ya) y devuelve su clave."""
+        key = self.key_for(text)
+        path = self._path(key)
+        if os.path.exists(path):
+            # Marca el texto como recién usado para las tareas de limpieza
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Escritura atómica: varios workers pueden guardar el mismo texto a la vez
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(text)
+            os.replace(tmp_path, path)
+        self._remember(key, text)
+        return key
+
+    def get(self, key: str) -> str:
+        """Devuelve el texto asociado a la clave o lanza KeyError."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                text = file.read()
+        except FileNotFoundError:
+            raise KeyError(f"No se encontró el contenido {key}")
+        self._remember(key, text)
+        return text
+
+    def keys(self):
+        """Claves guardadas en disco con la fecha de su último uso."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".txt"):
+                    yield name[:-4], os.path.getmtime(os.path.join(root, name))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
@@ -0,0 +1,71 @@
+import os
+from typing import Iterable, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Ventana de contexto (tokens de entrada + salida) por prefijo de modelo
+CONTEXT_LIMITS = {
+    "deepseek-chat": 64000,
+    "deepseek-reasoner": 64000,
+    "claude": 200000,
+}
+DEFAULT_CONTEXT_LIMIT = int(os.getenv("MINUTES_CONTEXT_TOKENS", "64000"))
+# Tokens extra que cuenta cada mensaje (rol y separadores)
+MESSAGE_OVERHEAD = 4
+
+_encoding = None
+_encoding_failed = False
+
+
+class TokenLimitError(ValueError):
+    """Una llamada superaría la ventana de contexto del modelo o el presupuesto de tokens de la ejecución."""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Tokens aproximados de un texto. Usa tiktoken (cl100k_base) si está disponible;
+    si no, una estimación de 4 caracteres por token.
+    """
+    global _encoding, _encoding_failed
+    if not text:
+        return 0
+    if tiktoken is not None and _encoding is None and not _encoding_failed:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # La codificación se descarga la primera vez; sin red se usa la estimación por caracteres
+            _encoding_failed = True
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def _content_text(content) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+
+
+def estimate_messages(messages: Iterable) -> int:
+    return sum(estimate_tokens(_content_text(message.content)) + MESSAGE_OVERHEAD for message in messages)
+
+
+def context_limit(model_name: str) -> int:
+    return next((limit for prefix, limit in CONTEXT_LIMITS.items() if model_name.startswith(prefix)), DEFAULT_CONTEXT_LIMIT)
+
+
+def check_call(node: str, model_name: str, input_tokens: int, max_output_tokens: int, remaining_budget: Optional[int] = None):
+    """Comprobación previa a una llamada: lanza TokenLimitError en lugar de enviar una petición que va a fallar."""
+    limit = context_limit(model_name)
+    if input_tokens + max_output_tokens > limit:
+        raise TokenLimitError(
+            f"La llamada de {node} necesita unos {input_tokens} tokens de entrada más {max_output_tokens} de salida "
+            f"y {model_name} admite {limit}"
+        )
+    if remaining_budget is not None and input_tokens > remaining_budget:
+        raise TokenLimitError(
+            f"La llamada de {node} necesita unos {input_tokens} tokens y quedan {remaining_budget} del presupuesto de la ejecución"
+        )
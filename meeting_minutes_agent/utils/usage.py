@@ -0,0 +1,71 @@
+from typing import Optional
+from langchain_core.messages import AIMessage
+
+# Precio en USD por millón de tokens: (entrada sin caché, entrada desde caché, escritura en caché, salida)
+MODEL_PRICES = {
+    "deepseek-chat": (0.27, 0.07, 0.27, 1.10),
+    "deepseek-reasoner": (0.55, 0.14, 0.55, 2.19),
+    "claude-3-5-haiku": (0.80, 0.08, 1.00, 4.00),
+    "claude-3-5-sonnet": (3.00, 0.30, 3.75, 15.00),
+}
+
+
+def estimate_cost(record: dict) -> Optional[float]:
+    """Costo estimado de una llamada a partir de su registro de uso; None si el modelo no tiene precio."""
+    prices = next((price for name, price in MODEL_PRICES.items() if record["model"].startswith(name)), None)
+    if prices is None:
+        return None
+    miss, hit, creation, output = prices
+    uncached = max(record["cache_miss_tokens"] - record["cache_creation_tokens"], 0)
+    cost = (
+        uncached * miss
+        + record["cache_hit_tokens"] * hit
+        + record["cache_creation_tokens"] * creation
+        + record["output_tokens"] * output
+    )
+    return round(cost / 1_000_000, 6)
+
+
+def usage_record(node: str, message: AIMessage, latency: Optional[float] = None) -> dict:
+    """
+    Resume el consumo de tokens de una llamada al modelo, incluyendo los tokens servidos desde la caché de prompt.
+    DeepSeek informa prompt_cache_hit_tokens / prompt_cache_miss_tokens; Anthropic y OpenAI lo hacen
+    a través de usage_metadata.input_token_details.
+    """
+    metadata = getattr(message, "response_metadata", None) or {}
+    usage = getattr(message, "usage_metadata", None) or {}
+    token_usage = metadata.get("token_usage") or metadata.get("usage") or {}
+    details = usage.get("input_token_details") or {}
+
+    input_tokens = usage.get("input_tokens", 0)
+    cache_hit = token_usage.get("prompt_cache_hit_tokens", details.get("cache_read", 0)) or 0
+    cache_miss = token_usage.get("prompt_cache_miss_tokens", input_tokens - cache_hit) or 0
+
+    record = {
+        "node": node,
+        "model": metadata.get("model_name") or metadata.get("model", ""),
+        "input_tokens": input_tokens,
+        "output_tokens": usage.get("output_tokens", 0),
+        "cache_hit_tokens": cache_hit,
+        "cache_miss_tokens": cache_miss,
+        "cache_creation_tokens": details.get("cache_creation", 0) or 0,
+        "latency_seconds": round(latency, 3) if latency is not None else None,
+    }
+    record["cost_usd"] = estimate_cost(record)
+    return record
+
+
+def cached_usage_record(node: str, model: str, latency: Optional[float] = None) -> dict:
+    """Registro de una llamada resuelta desde la caché de resultados: sin tokens ni costo."""
+    return {
+        "node": node,
+        "model": model,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_hit_tokens": 0,
+        "cache_miss_tokens": 0,
+        "cache_creation_tokens": 0,
+        "latency_seconds": round(latency, 3) if latency is not None else None,
+        "cost_usd": 0.0,
+        "result_cache": True,
+    }
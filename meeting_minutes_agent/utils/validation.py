@@ -0,0 +1,74 @@
+from typing import List, Set
+from meeting_minutes_agent.utils.chunking import normalize_text
+
+# Palabras vacías que no cuentan para decidir si dos textos hablan de lo mismo
+STOPWORDS = {
+    "para", "como", "pero", "porque", "este", "esta", "estos", "estas", "todo", "todos", "sobre",
+    "entre", "cuando", "donde", "desde", "hasta", "tambien", "cada", "otro", "otra", "otros", "otras",
+    "ser", "sera", "debe", "deben", "hacer", "realizar", "with", "from", "that", "this", "will",
+}
+
+
+def content_tokens(text: str) -> Set[str]:
+    """Palabras significativas (4 o más letras, sin palabras vacías) de un texto."""
+    return {token for token in normalize_text(text).split() if len(token) >= 4 and token not in STOPWORDS}
+
+
+def misaligned_actions(minutes: dict) -> List[str]:
+    """Acciones asignadas que no comparten ninguna palabra significativa con los puntos clave del acta."""
+    keypoint_tokens = set()
+    for keypoint in minutes.get("key_points") or []:
+        keypoint_tokens |= content_tokens(keypoint)
+
+    issues = []
+    for action in minutes.get("assigned_actions") or []:
+        description = action.get("description", "")
+        if not content_tokens(description) & keypoint_tokens:
+            issues.append(f"La acción asignada '{description}' no está alineada con ningún punto clave.")
+    return issues
+
+
+def missing_keypoints(minutes: dict, keypoints: List[str], min_overlap: float = 0.5) -> List[str]:
+    """Puntos clave aprobados cuyas palabras significativas no aparecen (al menos en min_overlap) en el acta."""
+    minutes_tokens = content_tokens(" ".join([
+        minutes.get("summary") or "",
+        *(minutes.get("key_points") or []),
+        *(minutes.get("action_items") or []),
+    ]))
+    issues = []
+    for keypoint in keypoints:
+        tokens = content_tokens(keypoint)
+        if tokens and len(tokens & minutes_tokens) / len(tokens) < min_overlap:
+            issues.append(f"El punto clave '{keypoint}' no aparece en el acta.")
+    return issues
+
+
+def unknown_owners(minutes: dict) -> List[str]:
+    """Responsables de acciones asignadas que no figuran entre los asistentes."""
+    attendee_tokens = [set(normalize_text(attendee.get("name") or "").split()) for attendee in minutes.get("attendees") or []]
+    issues = []
+    for action in minutes.get("assigned_actions") or []:
+        owner = set(normalize_text(action.get("owner") or "").split())
+        if not owner:
+            issues.append(f"La acción asignada '{action.get('description', '')}' no tiene responsable.")
+        elif not any(owner & tokens for tokens in attendee_tokens):
+            issues.append(f"El responsable '{action.get('owner')}' no figura entre los asistentes.")
+    return issues
+
+
+# Secciones que un acta completa nunca deja vacías
+REQUIRED_SECTIONS = ("title", "attendees", "summary", "key_points", "action_items")
+
+
+def empty_sections(minutes: dict) -> List[str]:
+    return [f"La sección '{field}' está vacía." for field in REQUIRED_SECTIONS if not minutes.get(field)]
+
+
+def validate_minutes(minutes: dict, keypoints: List[str]) -> List[str]:
+    """Todas las comprobaciones locales del acta; una lista vacía significa que no hace falta la reflexión."""
+    return (
+        empty_sections(minutes)
+        + missing_keypoints(minutes, keypoints)
+        + unknown_owners(minutes)
+        + misaligned_actions(minutes)
+    )
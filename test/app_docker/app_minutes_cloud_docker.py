@@ -68,16 +68,14 @@ async def process_keypoints(client, thread_id: str, assistant_id: str) -> bool:
             interrupt_before=["human_keypoints"]
         ):
             if hasattr(chunk, 'data') and isinstance(chunk.data, dict):
-                messages = chunk.data.get('messages', [])
-                if messages:
-                    ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                    if ai_messages:
-                        content = ai_messages[-1].get('content', '')
-                        # Solo imprimir si hay cambios
-                        if content != last_keypoints:
-                            print("\n🔄 Puntos clave revisados:")
-                            print(content)
-                            last_keypoints = content
+                artifact = chunk.data.get('keypoints')
+                if artifact:
+                    content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                    # Solo imprimir si hay cambios
+                    if content != last_keypoints:
+                        print("\n🔄 Puntos clave revisados:")
+                        print(content)
+                        last_keypoints = content
 
 async def process_minutes(client, assistant_id: str, minutes_text: str):
     """Process minutes text with a new thread and handle streaming."""
@@ -109,13 +107,11 @@ async def process_minutes(client, assistant_id: str, minutes_text: str):
         
         async for event in stream:
             if hasattr(event, 'data') and isinstance(event.data, dict):
-                messages = event.data.get('messages', [])
-                if messages:
-                    ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                    if ai_messages:
-                        content = ai_messages[-1].get('content', '')
-                        print("\n📊 Puntos clave identificados:")
-                        print(content)
+                artifact = event.data.get('keypoints')
+                if artifact:
+                    content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                    print("\n📊 Puntos clave identificados:")
+                    print(content)
         
         # Handle keypoints review
         if not await process_keypoints(client, thread_id, assistant_id):
@@ -133,21 +129,14 @@ async def process_minutes(client, assistant_id: str, minutes_text: str):
         
         async for event in stream:
             if hasattr(event, 'data') and isinstance(event.data, dict):
-                messages = event.data.get('messages', [])
-                if messages:
-                    ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                    if ai_messages:
-                        content = ai_messages[-1].get('content', '')
-                        # Solo imprimir si hay cambios significativos
-                        if content != last_content:
-                            last_content = content
-                            try:
-                                acta = json.loads(content)
-                                print("\n📄 Borrador del acta:")
-                                print(json.dumps(acta, ensure_ascii=False, indent=2))
-                            except json.JSONDecodeError:
-                                print("\n📄 Borrador del acta:")
-                                print(content)
+                artifact = event.data.get('minutes')
+                if artifact:
+                    content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                    # Solo imprimir si hay cambios significativos
+                    if content != last_content:
+                        last_content = content
+                        print("\n📄 Borrador del acta:")
+                        print(content)
         
         # Handle revisions
         while True:
@@ -175,18 +164,11 @@ async def process_minutes(client, assistant_id: str, minutes_text: str):
                     stream_mode="values"
                 ):
                     if hasattr(chunk, 'data') and isinstance(chunk.data, dict):
-                        messages = chunk.data.get('messages', [])
-                        if messages:
-                            ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                            if ai_messages:
-                                content = ai_messages[-1].get('content', '')
-                                try:
-                                    acta = json.loads(content)
-                                    print("\n📋 ACTA FINAL APROBADA:")
-                                    print(json.dumps(acta, ensure_ascii=False, indent=2))
-                                except json.JSONDecodeError:
-                                    print("\n📋 VERSIÓN FINAL APROBADA:")
-                                    print(content)
+                        artifact = chunk.data.get('minutes')
+                        if artifact:
+                            content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                            print("\n📋 ACTA FINAL APROBADA:")
+                            print(content)
                 break
             
             revision_count += 1
@@ -205,20 +187,13 @@ async def process_minutes(client, assistant_id: str, minutes_text: str):
                 interrupt_before=["human_critique"]
             ):
                 if hasattr(chunk, 'data') and isinstance(chunk.data, dict):
-                    messages = chunk.data.get('messages', [])
-                    if messages:
-                        ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                        if ai_messages:
-                            content = ai_messages[-1].get('content', '')
-                            if content != last_content:
-                                last_content = content
-                                try:
-                                    acta = json.loads(content)
-                                    print(f"\n📝 Revisión #{revision_count} del acta:")
-                                    print(json.dumps(acta, ensure_ascii=False, indent=2))
-                                except json.JSONDecodeError:
-                                    print(f"\n📝 Revisión #{revision_count}:")
-                                    print(content)
+                    artifact = chunk.data.get('minutes')
+                    if artifact:
+                        content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                        if content != last_content:
+                            last_content = content
+                            print(f"\n📝 Revisión #{revision_count} del acta:")
+                            print(content)
                                     
     except Exception as e:
         print(f"\n❌ Error durante el streaming: {str(e)}")
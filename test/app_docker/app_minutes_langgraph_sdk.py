@@ -33,6 +33,13 @@ async def initialize_assistant() -> Tuple[Optional[str], Optional[object]]:
         print(f"Error initializing assistant: {str(e)}")
         return None, None
 
+def print_section(data: dict):
+    """Print a minutes section as soon as the graph finishes writing it."""
+    value = data.get('value')
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, indent=2)
+    print(f"\n🧩 {data.get('field')}: {value}")
+
 async def process_keypoints(client, thread_id: str, assistant_id: str) -> bool:
     last_keypoints = None
     while True:
@@ -61,16 +68,14 @@ async def process_keypoints(client, thread_id: str, assistant_id: str) -> bool:
             interrupt_before=["human_keypoints"]
         ):
             if hasattr(chunk, 'data') and isinstance(chunk.data, dict):
-                messages = chunk.data.get('messages', [])
-                if messages:
-                    ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                    if ai_messages:
-                        content = ai_messages[-1].get('content', '')
-                        # Solo imprimir si hay cambios
-                        if content != last_keypoints:
-                            print("\n🔄 Puntos clave revisados:")
-                            print(content)
-                            last_keypoints = content
+                artifact = chunk.data.get('keypoints')
+                if artifact:
+                    content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                    # Solo imprimir si hay cambios
+                    if content != last_keypoints:
+                        print("\n🔄 Puntos clave revisados:")
+                        print(content)
+                        last_keypoints = content
 
 async def process_minutes(client, assistant_id: str, minutes_text: str):
     """Process minutes text with a new thread and handle streaming."""
@@ -111,12 +116,11 @@ async def process_minutes(client, assistant_id: str, minutes_text: str):
                 messages = event.data.get('messages', [])
                 if messages:
                     print(f"📬 Mensajes encontrados: {len(messages)}")
-                    ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                    if ai_messages:
-                        content = ai_messages[-1].get('content', '')
-                        print("\n📊 Puntos clave identificados:")
-                        print(content)
-                        print("-" * 50)
+                artifact = event.data.get('keypoints')
+                if artifact:
+                    print("\n📊 Puntos clave identificados:")
+                    print(json.dumps(artifact, ensure_ascii=False, indent=2))
+                    print("-" * 50)
         
         # Handle keypoints review
         if not await process_keypoints(client, thread_id, assistant_id):
@@ -128,27 +132,22 @@ async def process_minutes(client, assistant_id: str, minutes_text: str):
             assistant_id=assistant_id,
             thread_id=thread_id,
             input=None,
-            stream_mode="values",
+            stream_mode=["values", "custom"],
             interrupt_before=["human_critique"]
         )
         
         async for event in stream:
-            if hasattr(event, 'data') and isinstance(event.data, dict):
-                messages = event.data.get('messages', [])
-                if messages:
-                    ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                    if ai_messages:
-                        content = ai_messages[-1].get('content', '')
-                        # Solo imprimir si hay cambios significativos
-                        if content != last_content:
-                            last_content = content
-                            try:
-                                acta = json.loads(content)
-                                print("\n📄 Borrador del acta:")
-                                print(json.dumps(acta, ensure_ascii=False, indent=2))
-                            except json.JSONDecodeError:
-                                print("\n📄 Borrador del acta:")
-                                print(content)
+            if event.event == 'custom':
+                print_section(event.data)
+            elif hasattr(event, 'data') and isinstance(event.data, dict):
+                artifact = event.data.get('minutes')
+                if artifact:
+                    content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                    # Solo imprimir si hay cambios significativos
+                    if content != last_content:
+                        last_content = content
+                        print("\n📄 Borrador del acta:")
+                        print(content)
         
         # Handle revisions
         while True:
@@ -178,18 +177,11 @@ async def process_minutes(client, assistant_id: str, minutes_text: str):
                     stream_mode="values"
                 ):
                     if hasattr(chunk, 'data') and isinstance(chunk.data, dict):
-                        messages = chunk.data.get('messages', [])
-                        if messages:
-                            ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                            if ai_messages:
-                                content = ai_messages[-1].get('content', '')
-                                try:
-                                    acta = json.loads(content)
-                                    print("\n📋 ACTA FINAL APROBADA:")
-                                    print(json.dumps(acta, ensure_ascii=False, indent=2))
-                                except json.JSONDecodeError:
-                                    print("\n📋 VERSIÓN FINAL APROBADA:")
-                                    print(content)
+                        artifact = chunk.data.get('minutes')
+                        if artifact:
+                            content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                            print("\n📋 ACTA FINAL APROBADA:")
+                            print(content)
                 break
             
             revision_count += 1
@@ -204,24 +196,19 @@ async def process_minutes(client, assistant_id: str, minutes_text: str):
                 assistant_id=assistant_id,
                 thread_id=thread_id,
                 input=None,
-                stream_mode="values",
+                stream_mode=["values", "custom"],
                 interrupt_before=["human_critique"]
             ):
-                if hasattr(chunk, 'data') and isinstance(chunk.data, dict):
-                    messages = chunk.data.get('messages', [])
-                    if messages:
-                        ai_messages = [msg for msg in messages if msg.get('type') == 'ai']
-                        if ai_messages:
-                            content = ai_messages[-1].get('content', '')
-                            if content != last_content:
-                                last_content = content
-                                try:
-                                    acta = json.loads(content)
-                                    print(f"\n📝 Revisión #{revision_count} del acta:")
-                                    print(json.dumps(acta, ensure_ascii=False, indent=2))
-                                except json.JSONDecodeError:
-                                    print(f"\n📝 Revisión #{revision_count}:")
-                                    print(content)
+                if chunk.event == 'custom':
+                    print_section(chunk.data)
+                elif hasattr(chunk, 'data') and isinstance(chunk.data, dict):
+                    artifact = chunk.data.get('minutes')
+                    if artifact:
+                        content = json.dumps(artifact, ensure_ascii=False, indent=2)
+                        if content != last_content:
+                            last_content = content
+                            print(f"\n📝 Revisión #{revision_count} del acta:")
+                            print(content)
                                     
     except Exception as e:
         print(f"\n❌ Error durante el streaming: {str(e)}")
@@ -11,11 +11,12 @@ import uuid
 root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(root_dir)
 
-from company_research_interrupt.company_research_interrupt import graph
+from company_research_interrupt.company_research_interrupt import workflow
+from checkpointing import open_checkpointer, CHECKPOINT_DURABILITY
 
 load_dotenv()
 
-async def process_company_research(company_name: str):
+async def process_company_research(graph, company_name: str):
     """Process company research with user review of sources."""
     print("\n🔍 Investigando empresa...")
     
@@ -34,17 +35,21 @@ async def process_company_research(company_name: str):
         print("⏳ Iniciando investigación...")
         
         # Primera ejecución hasta el interrupt
-        result = await graph.ainvoke(initial_state, config, interrupt_before=["human_review"])
+        result = await graph.ainvoke(
+            initial_state, config, interrupt_before=["human_review"], durability=CHECKPOINT_DURABILITY
+        )
         
         while True:
             # Obtener el siguiente estado
-            snapshot = graph.get_state(config)
+            snapshot = await graph.aget_state(config)
             
             if not snapshot or not hasattr(snapshot, "next"):
                 break
                 
             # Continuar la ejecución
-            result = await graph.ainvoke(None, config, interrupt_before=["human_review"])
+            result = await graph.ainvoke(
+                None, config, interrupt_before=["human_review"], durability=CHECKPOINT_DURABILITY
+            )
             
             if result.get("report"):
                 print("\n📊 Reporte Final:")
@@ -60,19 +65,23 @@ async def main():
     print("\n🚀 Iniciando sistema de investigación empresarial...")
     print("\n👋 Bienvenido al sistema de investigación de empresas")
     print("ℹ️  Puede escribir 'salir' en cualquier momento para terminar")
-    
-    while True:
-        print("\n🏢 Por favor, ingrese el nombre de la empresa a investigar:")
-        company_name = input().strip()
-        
-        if company_name.lower() == 'salir':
-            print("\n👋 Gracias por usar el sistema de investigación empresarial.")
-            break
-            
-        if company_name:
-            await process_company_research(company_name)
-        else:
-            print("⚠️  Por favor, ingrese un nombre de empresa válido.")
+
+    # CHECKPOINTER=sqlite o postgres conserva las revisiones pendientes si el proceso se reinicia
+    async with open_checkpointer() as checkpointer:
+        graph = workflow.compile(checkpointer=checkpointer)
+
+        while True:
+            print("\n🏢 Por favor, ingrese el nombre de la empresa a investigar:")
+            company_name = input().strip()
+
+            if company_name.lower() == 'salir':
+                print("\n👋 Gracias por usar el sistema de investigación empresarial.")
+                break
+
+            if company_name:
+                await process_company_research(graph, company_name)
+            else:
+                print("⚠️  Por favor, ingrese un nombre de empresa válido.")
 
 if __name__ == "__main__":
     asyncio.run(main())
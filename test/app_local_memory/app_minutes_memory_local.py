@@ -11,7 +11,8 @@ import uuid
 root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(root_dir)
 
-from meeting_minutes_agent.minutes_agent_cloud import graph
+from meeting_minutes_agent.minutes_agent_cloud import builder
+from checkpointing import open_checkpointer, CHECKPOINT_DURABILITY
 
 load_dotenv()
 
@@ -23,112 +24,121 @@ def read_meeting_file(file_path: str) -> str:
     except Exception as e:
         raise Exception(f"Error al leer el archivo: {str(e)}")
 
-async def process_minutes(minutes_text: str):
+async def run_until_review(graph, state, config) -> dict:
+    """Ejecuta el grafo hasta la siguiente revisión humana (o hasta el final) y devuelve el estado."""
+    await graph.ainvoke(
+        state, config, interrupt_before=["human_keypoints", "human_critique"], durability=CHECKPOINT_DURABILITY
+    )
+    return await graph.aget_state(config)
+
+async def review_minutes(graph, config):
+    """Ciclo de revisión de los puntos clave y del acta de un hilo ya iniciado."""
+    snapshot = await graph.aget_state(config)
+    revision_count = 0
+
+    if snapshot.next and not {"human_keypoints", "human_critique"} & set(snapshot.next):
+        # La ejecución se cortó a mitad de un paso: se reanuda desde el último checkpoint
+        snapshot = await run_until_review(graph, None, config)
+
+    while "human_keypoints" in snapshot.next:
+        print("\n📊 Análisis de puntos clave:")
+        print(json.dumps(snapshot.values["keypoints"], ensure_ascii=False, indent=2))
+
+        print("\n📝 ¿Desea modificar los puntos clave? (Ingrese sus cambios o 'aprobado' para continuar):")
+        user_feedback = input().strip()
+
+        if user_feedback.lower() == "aprobado" or user_feedback == "":
+            # Continuamos con la generación del acta
+            print("\n⏳ Generando acta...")
+            await graph.aupdate_state(config, {"keypoints_approved": True}, as_node="human_keypoints")
+        else:
+            # El comentario se guarda en el hilo y revise_keypoints lo aplica al reanudar
+            print("\n🔄 Actualizando análisis...")
+            await graph.aupdate_state(config, {"messages": [HumanMessage(content=user_feedback)]}, as_node="human_keypoints")
+        snapshot = await run_until_review(graph, None, config)
+
+    # Ciclo de revisión del acta
+    while True:
+        content = json.dumps(snapshot.values.get("minutes"), ensure_ascii=False, indent=2)
+        print("\n📄 Borrador del acta:" if revision_count == 0 else f"\n📝 Revisión #{revision_count} del acta:")
+        print(content)
+
+        print("\n📝 Por favor, ingrese sus comentarios sobre el acta (o 'aprobado' si está conforme):")
+        user_comments = input().strip()
+
+        if user_comments.lower() == "aprobado" or user_comments == "":
+            await graph.aupdate_state(config, {"minutes_approved": True}, as_node="human_critique")
+            await run_until_review(graph, None, config)
+            print("\n📋 ACTA FINAL APROBADA:")
+            print(content)
+            print("\n✅ Proceso de acta completado")
+            break
+
+        # Actualizar con los comentarios del usuario
+        revision_count += 1
+        print(f"\n🔄 Procesando revisión #{revision_count}...")
+        await graph.aupdate_state(config, {"messages": [HumanMessage(content=user_comments)]}, as_node="human_critique")
+        snapshot = await run_until_review(graph, None, config)
+
+async def process_minutes(graph, minutes_text: str):
     """Process minutes text and handle user interactions."""
     print("\n🔍 Procesando acta...")
-    
+
     initial_state = {
         "messages": [HumanMessage(content=minutes_text)],
     }
-    
-    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
-    revision_count = 0
-    
+
+    thread_id = str(uuid.uuid4())
+    config = {"configurable": {"thread_id": thread_id}}
+    print(f"🧵 Identificador de la revisión: {thread_id}")
+
     try:
         # Análisis preliminar y ciclo de revisión
         print("⏳ Analizando puntos clave y acciones...")
-        result = await graph.ainvoke(initial_state, config, interrupt_before=["revise_keypoints", "generate"])
-        
-        while True:
-            content = result["messages"][-1].content
-            try:
-                analysis = json.loads(content)
-                print("\n📊 Análisis de puntos clave:")
-                print(json.dumps(analysis, ensure_ascii=False, indent=2))
-            except json.JSONDecodeError:
-                print("\n📊 Análisis de puntos clave:")
-                print(content)
-
-            print("\n📝 ¿Desea modificar los puntos clave? (Ingrese sus cambios o 'aprobado' para continuar):")
-            user_feedback = input().strip()
-            
-            if user_feedback.lower() == "aprobado" or user_feedback == "":
-                # Continuamos con la generación del acta
-                result = await graph.ainvoke(result, config, interrupt_before=["human_critique"])
-                break
-                
-            # Actualizar con el feedback del usuario
-            print("\n🔄 Actualizando análisis...")
-            new_state = {
-                "messages": result["messages"] + [HumanMessage(content=user_feedback)]
-            }
-            # Interrumpimos antes de revise_keypoints y generate para mantener el ciclo de revisión
-            result = await graph.ainvoke(new_state, config, interrupt_before=["revise_keypoints", "generate"])
-
-        # Obtenemos el contenido del acta generada
-        content = result["messages"][-1].content
-        try:
-            acta = json.loads(content)
-            print("\n📄 Borrador inicial del acta:")
-            print(json.dumps(acta, ensure_ascii=False, indent=2))
-        except json.JSONDecodeError:
-            print("\n📄 Borrador inicial:")
-            print(content)
+        await run_until_review(graph, initial_state, config)
+        await review_minutes(graph, config)
+    except Exception as e:
+        print(f"\n❌ Error durante el procesamiento: {str(e)}")
 
-        # Ciclo de revisión del acta
-        while True:
-            print("\n📝 Por favor, ingrese sus comentarios sobre el acta (o 'aprobado' si está conforme):")
-            user_comments = input().strip()
-            
-            if user_comments.lower() == "aprobado" or user_comments == "":
-                print("\n✨ Generando versión final aprobada...")
-                try:
-                    acta = json.loads(content)
-                    print("\n📋 ACTA FINAL APROBADA:")
-                    print(json.dumps(acta, ensure_ascii=False, indent=2))
-                except json.JSONDecodeError:
-                    print("\n📋 VERSIÓN FINAL APROBADA:")
-                    print(content)
-                print("\n✅ Proceso de acta completado")
-                break
-            
-            # Actualizar con los comentarios del usuario
-            revision_count += 1
-            print(f"\n🔄 Procesando revisión #{revision_count}...")
-            new_state = {
-                "messages": result["messages"] + [HumanMessage(content=user_comments)]
-            }
-            
-            result = await graph.ainvoke(new_state, config, interrupt_before=["human_critique"])
-            content = result["messages"][-1].content
-            
-            try:
-                acta = json.loads(content)
-                print(f"\n📝 Revisión #{revision_count} del acta:")
-                print(json.dumps(acta, ensure_ascii=False, indent=2))
-            except json.JSONDecodeError:
-                print(f"\n📝 Revisión #{revision_count}:")
-                print(content)
+    print("\n✅ Procesamiento completado")
 
+async def resume_minutes(graph, thread_id: str):
+    """Retoma una revisión pendiente guardada por el checkpointer."""
+    config = {"configurable": {"thread_id": thread_id}}
+    snapshot = await graph.aget_state(config)
+    if not snapshot.values:
+        print(f"\n⚠️ No se encontró la revisión {thread_id}")
+        return
+    if snapshot.values.get("minutes_approved"):
+        print("\nℹ️  Esta revisión ya terminó")
+        print(json.dumps(snapshot.values.get("minutes"), ensure_ascii=False, indent=2))
+        return
+    try:
+        await review_minutes(graph, config)
     except Exception as e:
         print(f"\n❌ Error durante el procesamiento: {str(e)}")
-    
-    print("\n✅ Procesamiento completado")
 
 async def main():
     print("\n🚀 Iniciando sistema de actas...")
     print("\n👋 Bienvenido al sistema de actas de reunión")
     print("ℹ️  Puede escribir 'salir' en cualquier momento para terminar")
-    
+
+    # CHECKPOINTER=sqlite o postgres conserva las revisiones pendientes si el proceso se reinicia
+    async with open_checkpointer() as checkpointer:
+        graph = builder.compile(checkpointer=checkpointer)
+        await menu(graph)
+
+async def menu(graph):
     while True:
         print("\n📝 Por favor, seleccione una opción:")
         print("1. Ingresar texto directamente")
         print("2. Cargar archivo .txt")
-        print("3. Salir")
+        print("3. Retomar una revisión pendiente")
+        print("4. Salir")
         
         option = input("\nOpción: ").strip()
         
-        if option == "3" or option.lower() == "salir":
+        if option == "4" or option.lower() == "salir":
             print("\n👋 Gracias por usar el sistema de actas.")
             break
             
@@ -146,12 +156,16 @@ async def main():
             except Exception as e:
                 print(f"\n❌ Error al cargar el archivo: {str(e)}")
                 continue
+        elif option == "3":
+            print("\n🧵 Por favor, ingrese el identificador de la revisión:")
+            await resume_minutes(graph, input().strip())
+            continue
         else:
             print("\n⚠️ Opción no válida. Por favor, intente nuevamente.")
             continue
             
         if minutes_text:
-            await process_minutes(minutes_text)
+            await process_minutes(graph, minutes_text)
         else:
             print("⚠️ Por favor, ingrese un texto válido.")
 
@@ -0,0 +1,34 @@
+"""
+La normalización de transcripciones quita muletillas y repeticiones sin perder contenido.
+
+Uso:
+    python -m pytest test/test_normalize.py
+"""
+import os
+import sys
+
+# Añadir el directorio raíz al PYTHONPATH
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from meeting_minutes_agent.utils.extraction import extract_meeting_facts
+from meeting_minutes_agent.utils.normalize import clean_utterance, normalize_transcript
+
+
+def test_removes_fillers_and_repeats():
+    assert clean_utterance("eh, no sé, no sé, no sé si mmm viene") == "no sé si viene"
+
+
+def test_keeps_repeated_numbers():
+    assert clean_utterance("3 3 4 5 5 6") == "3 3 4 5 5 6"
+
+
+def test_keeps_millimetres():
+    assert clean_utterance("50 mm de ancho") == "50 mm de ancho"
+    assert clean_utterance("porque mida 10 mm más") == "porque mida 10 mm más"
+
+
+def test_heading_stays_on_its_own_line():
+    normalized, _ = normalize_transcript("Texto transcrito:\nSi es crédito, si es de contado.\nAna: Bien.\n")
+    assert normalized.splitlines() == ["Texto transcrito:", "Si es crédito, si es de contado.", "Ana: Bien."]
+    assert [speaker["label"] for speaker in extract_meeting_facts(normalized)["speakers"]] == ["Ana"]
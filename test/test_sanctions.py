@@ -0,0 +1,84 @@
+"""
+El índice de sanciones solo debe acelerar la búsqueda: para cualquier consulta tiene que devolver
+exactamente las mismas entidades que recorrer todo el dataset con names_match.
+
+Uso:
+    python -m pytest test/test_sanctions.py
+"""
+import os
+import random
+import sys
+
+import pytest
+
+# Añadir el directorio raíz al PYTHONPATH
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from company_researcher.sanctions import SANCTIONS_XML, SanctionsIndex, names_match
+
+RANDOM_QUERIES = 2000
+EDGE_QUERIES = [
+    "", "  ", "x", "de", "sa", "Casa Grajales", "Petroleos de Venezuela", "PDVSA",
+    "Banco de Venezuela SA", "Tareck El Aissami", "ab cd", "Ñandú S.A.",
+]
+
+
+def full_scan(index: SanctionsIndex, query: str):
+    """Entidades que coinciden recorriendo el dataset completo, como antes del índice."""
+    return [
+        entity_id for entity_id, entity in enumerate(index.entities)
+        if any(names_match(name, query) for name in entity["names"])
+    ]
+
+
+def random_queries(index: SanctionsIndex, count: int, seed: int = 22):
+    """Palabras del índice enteras, recortadas, alargadas o inventadas, en consultas de 1 a 3 palabras."""
+    rng = random.Random(seed)
+    vocabulary = [index._tokens.key(position) for position in range(len(index._tokens))]
+    queries = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.choice([1, 1, 2, 3])):
+            word = rng.choice(vocabulary)
+            roll = rng.random()
+            if roll < 0.3 and len(word) > 2:
+                start = rng.randrange(len(word))
+                word = word[start:rng.randrange(start + 1, len(word) + 1)]
+            elif roll < 0.45:
+                word += rng.choice(["s", "co", "xyz"])
+            elif roll < 0.55:
+                word = "".join(rng.choice("abcdeinorst") for _ in range(rng.randint(1, 6)))
+            words.append(word)
+        queries.append(" ".join(words))
+    return queries
+
+
+@pytest.fixture(scope="module")
+def xml_index():
+    if not os.path.exists(SANCTIONS_XML):
+        pytest.skip(f"No se encontró el dataset de sanciones en {SANCTIONS_XML}")
+    return SanctionsIndex.from_xml(SANCTIONS_XML)
+
+
+@pytest.fixture(scope="module")
+def cached_index(xml_index, tmp_path_factory):
+    cache_path = str(tmp_path_factory.mktemp("sanctions") / "sanctions.idx")
+    xml_index.write_cache(cache_path)
+    return SanctionsIndex.from_cache(cache_path, xml_index.path, xml_index.mtime)
+
+
+@pytest.mark.parametrize("index_name", ["xml_index", "cached_index"])
+def test_candidates_match_full_scan(index_name, request):
+    index = request.getfixturevalue(index_name)
+    for query in EDGE_QUERIES + random_queries(index, RANDOM_QUERIES):
+        expected = full_scan(index, query)
+        assert set(expected) <= set(index.candidates(query)), query
+        assert [match["all_names"] for match in index.screen(query)] == \
+            [index.entities[entity_id]["names"] for entity_id in expected], query
+
+
+def test_cache_keeps_entities(xml_index, cached_index):
+    assert len(cached_index.entities) == len(xml_index.entities)
+    assert cached_index.total_entities == xml_index.total_entities
+    assert list(cached_index.entities) == list(xml_index.entities)